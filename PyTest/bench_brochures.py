@@ -0,0 +1,34 @@
+"""
+Memory and time to serve a 100 MB brochure: the (content, content_type) tuple API vs
+iter_brochure chunks vs send_brochure (os.sendfile). Python heap peak via tracemalloc.
+Run: python bench_brochures.py [MB]
+"""
+
+import os, sys, time, tracemalloc
+from inco_module import IncoSite
+
+def measure(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+if __name__ == "__main__":
+    mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    site = IncoSite()
+    admin = site.admin_login("admin", "adminpwd")
+    chunk = os.urandom(1 << 20)
+    holder = {}
+    upload = measure(lambda: holder.update(bid=site.upload_brochure(admin, "catalog.pdf", (chunk for _ in range(mb)))))
+    bid = holder["bid"]
+    with open(os.devnull, "wb") as sink:
+        runs = [("upload (1 MB chunks)", upload),
+                ("download_brochure", measure(lambda: site.download_brochure(bid))),
+                ("iter_brochure -> write", measure(lambda: sum(map(sink.write, site.iter_brochure(bid))))),
+                ("send_brochure (sendfile)", measure(lambda: site.send_brochure(bid, sink))),
+                ("range (middle 10%)", measure(lambda: sink.write(site.brochure_range(bid, mb << 19, (mb << 19) + (mb << 20) // 10))))]
+    for label, (elapsed, peak) in runs:
+        print(f"{label:>26}: {elapsed*1000:>8.1f} ms  peak heap {peak/2**20:>8.2f} MiB")
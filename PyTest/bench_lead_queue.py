@@ -0,0 +1,34 @@
+"""
+Enquiry latency and end-to-end throughput with a 20 ms CRM round-trip:
+inline send_crm_lead per enquiry vs the batched LeadQueue.
+Run: python bench_lead_queue.py [N] [CLIENTS]
+"""
+
+import statistics, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from inco_module import IncoSite
+from lead_queue import LeadQueue, LocalCRM
+
+def run(n, clients, queued):
+    crm = LocalCRM(latency=0.02)
+    site = IncoSite(crm=crm, lead_queue=LeadQueue(maxsize=10_000, max_batch=100, workers=2) if queued else None)
+    def enquire(i):
+        t0 = time.perf_counter()
+        site.submit_enquiry(name=f"Buyer {i}", email=f"buyer{i}@example.com", message="Quote for bowling lanes")
+        return time.perf_counter() - t0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool: latencies = sorted(pool.map(enquire, range(n)))
+    if queued:
+        site.lead_queue.join()
+        site.lead_queue.close()
+    elapsed = time.perf_counter() - t0
+    assert len(crm.received) == n
+    return latencies, elapsed, crm.round_trips
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    for label, queued in [("inline", False), ("LeadQueue", True)]:
+        lat, elapsed, trips = run(n, clients, queued)
+        p50, p99 = statistics.median(lat) * 1000, lat[int(len(lat) * 0.99)] * 1000
+        print(f"{label:>10}: p50 {p50:>7.2f} ms  p99 {p99:>7.2f} ms  {n/elapsed:>8.0f} leads/s delivered  {trips} CRM round-trips")
@@ -0,0 +1,43 @@
+"""
+Ingest throughput and memory for N receipt uploads (a share of them re-uploads):
+blobs kept in the claim dict (the old upload_receipt) vs the content-addressed ReceiptStore.
+Run: python bench_receipt_store.py [N]
+"""
+
+import random, sys, time, tracemalloc
+from zento_module import ZentoApp
+
+SIZE, DUP = 8 * 1024, 0.4
+
+def receipts(n):
+    rnd = random.Random(3)
+    pool = []
+    for _ in range(n):
+        if pool and rnd.random() < DUP: yield rnd.choice(pool)
+        else:
+            blob = rnd.randbytes(SIZE)
+            pool.append(blob)
+            if len(pool) > 1000: pool.pop(0)
+            yield blob
+
+def ingest(n, in_memory):
+    app = ZentoApp()
+    token = app.login("employee", "alice", "alicepwd")
+    claim_ids = [app.create_claim(token, f"Claim {i}", 10.0, "2025-09-01", "Travel") for i in range(n // 10)]
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for i, blob in enumerate(receipts(n)):
+        claim_id = claim_ids[i % len(claim_ids)]
+        if in_memory: app.receipts.setdefault(claim_id, []).append({"filename": f"r{i}.jpg", "content": blob, "size": len(blob)})
+        else: app.upload_receipt(token, claim_id, f"r{i}.jpg", blob)
+    elapsed = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return app, elapsed, mem
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for label, in_memory in [("blobs in memory", True), ("ReceiptStore", False)]:
+        app, elapsed, mem = ingest(n, in_memory)
+        print(f"{label:>16}: {n/elapsed:>8.0f} receipts/s  {mem/2**20:>8.1f} MiB held  {app.receipt_store.stats}")
+        del app
@@ -0,0 +1,87 @@
+# --------------------- EXPENSE POLICY RULES (used by zento_module.py) -----------------------
+
+from itertools import compress, repeat
+from operator import gt, itemgetter
+from string import Formatter
+
+PER_DIEM_MESSAGE = "{category} claim of {amount} exceeds per-diem of {max}"
+DAILY_MESSAGE = "{employee} {category} total of {total} on {date} exceeds daily cap of {max}"
+INF = float("inf")
+
+_CONVERT = {"r": repr, "s": str, "a": ascii}
+
+def _escape(text): return text.replace("{", "{{").replace("}", "}}")
+
+def _prebind(template, **known):
+    # formats the `known` fields now and rebuilds every other field, conversion and spec included
+    # ("{amount:.2f}"), so the per-claim format_map sees the template it was written as
+    out = []
+    for literal, field, spec, conv in Formatter().parse(template):
+        out.append(_escape(literal))
+        if field is None: continue
+        if field in known and "{" not in spec:
+            value = known[field]
+            out.append(_escape(format(_CONVERT[conv](value) if conv else value, spec)))
+        else: out.append("{" + field + ("!" + conv if conv else "") + (":" + spec if spec else "") + "}")
+    return "".join(out)
+
+class RuleSet:
+    """Policy rules declared as data, compiled once into per-category lookup tables.
+
+    {"kind": "limit", "category": "Meals", "max": 200.0}  -- a single claim over max (category None = any)
+    {"kind": "daily", "category": "Meals", "max": 300.0}  -- an employee's claims in a category on one date, summed
+
+    Optional "message" overrides the issue template; it is formatted with the claim's fields plus max
+    (and total for daily rules)."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._limits, self._daily = {}, {}
+        for i, rule in enumerate(self.rules):
+            if rule["kind"] == "limit": table, default = self._limits, PER_DIEM_MESSAGE
+            elif rule["kind"] == "daily": table, default = self._daily, DAILY_MESSAGE
+            else: raise ValueError(f"Unknown rule kind: {rule['kind']}")
+            table.setdefault(rule.get("category"), []).append((i, float(rule["max"]), rule.get("message", default)))
+        self._plans = {}
+
+    def _plan(self, category):
+        # rules that apply to a category in declaration order (its own and the category-None ones
+        # interleaved by position), with category and max baked into the message
+        if category not in self._plans:
+            self._plans[category] = tuple(
+                [(cap, _prebind(message, category=category, max=cap))
+                 for _, cap, message in sorted(table.get(category, []) + table.get(None, []))]
+                for table in (self._limits, self._daily))
+        return self._plans[category]
+
+    @property
+    def needs_peers(self): return bool(self._daily)
+
+    def check_many(self, claims):
+        """{claim_id: [issues]} for the claims that break a rule, in one pass per rule.
+        Amounts and categories are pulled out as columns and compared against a per-category
+        cap column with map/compress, so only flagged claims are touched in Python."""
+        claims = claims if isinstance(claims, list) else list(claims)
+        cats = list(map(itemgetter("category"), claims))
+        amounts = list(map(itemgetter("amount"), claims))
+        plans = {cat: self._plan(cat) for cat in set(cats)}
+        issues = {}
+        for layer in range(max((len(p[0]) for p in plans.values()), default=0)):
+            caps = {cat: p[0][layer][0] for cat, p in plans.items() if len(p[0]) > layer}
+            messages = {cat: p[0][layer][1] for cat, p in plans.items() if len(p[0]) > layer}
+            hits = compress(zip(claims, cats), map(gt, amounts, map(caps.get, cats, repeat(INF))))
+            if layer == 0: issues = {c["id"]: [messages[cat].format_map(c)] for c, cat in hits}
+            else:
+                for c, cat in hits: issues.setdefault(c["id"], []).append(messages[cat].format_map(c))
+        daily = {cat: p[1] for cat, p in plans.items() if p[1]}
+        if daily:
+            group = [claims[i] for i in compress(range(len(claims)), map(daily.__contains__, cats))]
+            totals = {}
+            for c in group:
+                key = (c["employee"], c["date"], c["category"])
+                totals[key] = totals.get(key, 0.0) + c["amount"]
+            for c in group:
+                total = totals[(c["employee"], c["date"], c["category"])]
+                for cap, message in daily[c["category"]]:
+                    if total > cap: issues.setdefault(c["id"], []).append(message.format_map({**c, "total": total}))
+        return issues
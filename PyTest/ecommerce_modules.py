@@ -1,60 +1,199 @@
 # --------------------- CREATE A ECOMMERCE SIMULATION AND TESTS; THEN RUN pytest -----------------------
 
-import os, sys, subprocess, textwrap
+import hashlib, json, os, sys, subprocess, textwrap, time
 project_dir = "/mnt/data/ecom_demo"
-if os.path.exists(project_dir):
-    # remove previous to keep clean
-    import shutil
-    shutil.rmtree(project_dir)
 os.makedirs(project_dir, exist_ok=True)
 
+# Files are only rewritten when their content changes, so mtimes stay put and __pycache__
+# and .pytest_cache remain valid between runs. The manifest remembers each file's hash and
+# stat so unchanged files aren't even re-read; files dropped from this script get deleted.
+gen_start = time.perf_counter()
+manifest_path = os.path.join(project_dir, ".ecom_manifest.json")
+try:
+    with open(manifest_path) as f: manifest = json.load(f)
+except (FileNotFoundError, ValueError): manifest = {}
+new_manifest, rewritten = {}, []
+
+def write_generated(name, content):
+    path = os.path.join(project_dir, name)
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    try: st = os.stat(path)
+    except FileNotFoundError: st = None
+    known = manifest.get(name)
+    unchanged = st is not None and known == [digest, st.st_size, st.st_mtime_ns]
+    if not unchanged and st is not None and st.st_size == len(data):
+        with open(path, "rb") as f: unchanged = hashlib.sha256(f.read()).hexdigest() == digest
+    if not unchanged:
+        with open(path, "wb") as f: f.write(data)
+        rewritten.append(name)
+        st = os.stat(path)
+    new_manifest[name] = [digest, st.st_size, st.st_mtime_ns]
+
 # -------------------------------- Write minimal ecom_module --------------------------------
 ecom_module = textwrap.dedent(r'''
+    import asyncio, copy, heapq, itertools, math, threading, time, weakref
+    from bisect import bisect_left, bisect_right, insort
+    from contextlib import ExitStack, nullcontext
+    from search_index import SearchIndex
+    from async_gateway import ThreadedGateway
+    from session_store import SessionStore
+    from overlay_catalog import OverlayCatalog
+    import snapshot
+
     class PaymentError(Exception):
         pass
 
+    def _add_exact(parts, x):
+        # Shewchuk's exact float accumulation (the partials math.fsum keeps internally): fsum(parts) is the
+        # correctly rounded sum of everything added, so cart lines can be adjusted by +new/-old without drift,
+        # and the total doesn't change with the interpreter (sum() of floats became compensated in 3.12)
+        i = 0
+        for y in parts:
+            if abs(x) < abs(y): x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                parts[i] = lo
+                i += 1
+            x = hi
+        parts[i:] = [x]
+
     class ECommerceSite:
-        def __init__(self):
-            self.items = {
+        def __init__(self, thread_safe=False, max_in_flight=64, catalog=dict, session_ttl=None, max_sessions=None):
+            # catalog: mapping type the items are loaded into, e.g. dict or columnar_catalog.ColumnarCatalog
+            self.items = catalog({
                 1: {"name":"Smartphone X Pro","price":15000.0,"stock":10},
                 2: {"name":"Wireless Earbuds","price":1500.0,"stock":0},
                 3: {"name":"Laptop Alpha","price":55000.0,"stock":5},
                 4: {"name":"Coffee Maker","price":3500.0,"stock":3},
                 5: {"name":"Phone Cover - Blue","price":299.0,"stock":100},
-            }
+            })
             self.users = {"alice":"alicepwd"}
-            self._session_seq = 0
-            self.sessions = {}
-            self._order_seq = 0
+            self._session_ids = itertools.count(1)   # next() on a count is atomic, unlike `seq += 1`
+            # session_ttl (idle seconds) / max_sessions switch to a bounded, LRU-evicting SessionStore
+            if session_ttl is None and max_sessions is None: self.sessions = {}
+            else: self.sessions = SessionStore(ttl=session_ttl, max_size=max_sessions, on_evict=self._drop_session)
+            self._item_carts = {}     # item_id -> {token: session} of carts holding it
+            self._order_ids = itertools.count(1)
             self.orders = {}
+            # secondary order indexes, kept current by checkout/cancel_order; see find_orders()
+            self.clock = time.time
+            self._orders_by_user = {}     # user -> [order_id] in creation order
+            self._orders_by_status = {}   # status -> sorted [(created_at, order_id)]
+            self._orders_by_time = []     # sorted [(created_at, order_id)] over all orders
+            self._last_order_key = None   # (created_at, id) of the last indexed order
+            self._ids_in_time_order = True    # every index above also ascends by id (the clock never ran back)
             self.coupons = {"FLAT50": lambda t:max(t-50,0), "PERC10": lambda t:t*0.9 if t>=1000 else t}
             import payment_gateway as pg
             self.payment_gateway = pg
+            self._index = None        # SearchIndex, built on first search so big catalogs load fast
+            self._index_shared = False    # clone() shares the parent's index until the first write
+            # thread_safe: per-SKU stock locks, taken in sorted order so overlapping carts can't deadlock
+            self.thread_safe = thread_safe
+            self._stock_locks = {}
+            self._guard = threading.Lock()
+            # checkout_async: gateway with `async authorize()`; None wraps the sync payment_gateway
+            self.async_gateway = None
+            self.max_in_flight = max_in_flight
+            self._payment_slots = weakref.WeakKeyDictionary()   # event loop -> Semaphore; see _slots()
 
         def load_homepage(self): return True
 
         def login(self, username, password):
             if username in self.users and self.users[username]==password:
-                self._session_seq += 1
-                token = f"session_{self._session_seq}"
-                self.sessions[token] = {"user":username, "cart":{}, "orders": []}
+                token = f"session_{next(self._session_ids)}"
+                self.sessions[token] = {"user":username, "cart":{}, "orders": [], "subtotal_parts": []}
                 return token
             raise ValueError("Invalid credentials")
 
-        def search(self, query):
-            q = query.lower()
-            return [{"id":i, **m} for i,m in self.items.items() if q in m["name"].lower()]
+        def add_item(self, item_id, name, price, stock=0):
+            if item_id in self.items: raise ValueError("Item exists")
+            self.items[item_id] = {"name":name, "price":float(price), "stock":stock}
+            if self._index is not None: self._writable_index().add(item_id, name)
+            return item_id
+
+        def update_item(self, item_id, **fields):
+            # change item fields through here (not self.items directly) so the search index follows renames
+            if item_id not in self.items: raise ValueError("Invalid item")
+            old_price = self.items[item_id]["price"]
+            self.items[item_id].update(fields)
+            if "name" in fields and self._index is not None: self._writable_index().add(item_id, fields["name"])
+            if "price" in fields:
+                new_price = self.items[item_id]["price"]
+                for s in self._item_carts.get(item_id, {}).values():
+                    q = s["cart"][item_id]
+                    _add_exact(s["subtotal_parts"], new_price*q)
+                    _add_exact(s["subtotal_parts"], -(old_price*q))
+
+        def _search_index(self):
+            if self._index is None:
+                self._index = SearchIndex()
+                for i,m in self.items.items(): self._index.add(i, m["name"])
+            return self._index
+
+        def _writable_index(self):
+            if self._index_shared: self._index, self._index_shared = self._index.copy(), False
+            return self._index
+
+        def search(self, query, in_stock=False, limit=None, whole_word=False):
+            index, items = self._search_index(), self.items
+            where = (lambda i: items[i]["stock"] > 0) if in_stock else None
+            ids = (index.tokens if whole_word else index.query)(query, limit, where)
+            return [{"id":i, **items[i]} for i in ids]
 
         def add_to_cart(self, session, item_id, qty=1):
             if session not in self.sessions: raise ValueError("Invalid session")
             if item_id not in self.items: raise ValueError("Invalid item")
             if self.items[item_id]["stock"] < qty: raise ValueError("Not enough stock")
-            cart = self.sessions[session]["cart"]
-            cart[item_id] = cart.get(item_id,0) + qty
+            s = self.sessions[session]
+            self._adjust_line(s, item_id, self.items[item_id]["price"], qty)
+            self._item_carts.setdefault(item_id, {})[session] = s
+
+        def _adjust_line(self, s, item_id, price, qty):
+            # O(1): swap the line's old value for its new one in the exact partials
+            cart = s["cart"]
+            old = cart.get(item_id, 0)
+            _add_exact(s["subtotal_parts"], price*(old+qty))
+            if old: _add_exact(s["subtotal_parts"], -(price*old))
+            cart[item_id] = old + qty
 
         def cart_total(self, session):
-            cart = self.sessions[session]["cart"]
-            return sum(self.items[i]["price"]*q for i,q in cart.items())
+            """math.fsum of price*qty over the cart, kept up to date by add_to_cart / update_item."""
+            return math.fsum(self.sessions[session]["subtotal_parts"])
+
+        def add_to_cart_many(self, rows):
+            """add_to_cart() for many (session, item_id, qty) rows in one call.
+
+            Every row is validated before any cart changes, so one bad row leaves all carts untouched.
+            """
+            rows = list(rows)
+            sessions, items, item_carts = self.sessions, self.items, self._item_carts
+            prices = {}
+            for session, item_id, qty in rows:
+                if session not in sessions: raise ValueError("Invalid session")
+                if item_id not in items: raise ValueError("Invalid item")
+                if item_id not in prices:
+                    m = items[item_id]
+                    prices[item_id] = (m["price"], m["stock"])
+                if prices[item_id][1] < qty: raise ValueError("Not enough stock")
+            for session, item_id, qty in rows:
+                s = sessions[session]
+                self._adjust_line(s, item_id, prices[item_id][0], qty)
+                carts = item_carts.get(item_id)
+                if carts is None: carts = item_carts[item_id] = {}
+                carts[session] = s
+
+        def cart_totals(self, sessions):
+            """cart_total() for many sessions."""
+            by_token, fsum = self.sessions, math.fsum
+            return [fsum(by_token[token]["subtotal_parts"]) for token in sessions]
+
+        def preview_coupons(self, sessions, code):
+            """What apply_coupon(code) would return for each session, without recording the coupon."""
+            if code not in self.coupons: raise ValueError("Invalid coupon")
+            coupon = self.coupons[code]
+            return [coupon(t) for t in self.cart_totals(sessions)]
 
         def apply_coupon(self, session, code):
             if code not in self.coupons: raise ValueError("Invalid coupon")
@@ -63,36 +202,201 @@ ecom_module = textwrap.dedent(r'''
             return self.coupons[code](total)
 
         def checkout(self, session, payment_details):
+            s, cart, total = self._begin_checkout(session)
+            try: success = self.payment_gateway.process(payment_details, amount=total)
+            except Exception:
+                self._restock(cart)
+                raise
+            return self._finish_checkout(session, s, cart, total, success)
+
+        async def checkout_async(self, session, payment_details, gateway=None):
+            """Same as checkout(), but awaits the gateway so many sessions' payments overlap."""
+            gateway = gateway or self.async_gateway or ThreadedGateway(self.payment_gateway)
+            s, cart, total = self._begin_checkout(session)
+            try:
+                async with self._slots():
+                    success = await gateway.authorize(payment_details, amount=total)
+            except BaseException:
+                self._restock(cart)
+                raise
+            return self._finish_checkout(session, s, cart, total, success)
+
+        def _slots(self):
+            # an asyncio.Semaphore binds to the first loop that waits on it, so keep one per running loop
+            loop = asyncio.get_running_loop()
+            slots = self._payment_slots.get(loop)
+            if slots is None: slots = self._payment_slots[loop] = asyncio.Semaphore(self.max_in_flight)
+            return slots
+
+        def _begin_checkout(self, session):
             if session not in self.sessions: raise ValueError("Invalid session")
-            cart = self.sessions[session]["cart"]
+            s = self.sessions[session]    # held until _finish_checkout: the store may evict it while we pay
+            cart = s["cart"]
             if not cart: raise ValueError("Cart empty")
-            total = self.cart_total(session)
-            if "last_coupon" in self.sessions[session]:
-                total = self.coupons[self.sessions[session]["last_coupon"]](total)
-            success = self.payment_gateway.process(payment_details, amount=total)
-            if not success: raise PaymentError("Payment failed")
-            self._order_seq += 1
-            order_id = self._order_seq
-            self.orders[order_id] = {"id":order_id, "items":cart.copy(), "total":total, "status":"Confirmed"}
-            # reduce stock and empty cart
-            for iid, q in cart.items(): self.items[iid]["stock"] -= q
-            self.sessions[session]["cart"] = {}
-            self.sessions[session]["orders"].append(order_id)
+            total = math.fsum(s["subtotal_parts"])
+            if "last_coupon" in s: total = self.coupons[s["last_coupon"]](total)
+            cart = cart.copy()
+            self._reserve_stock(cart)     # re-validates stock; add_to_cart's check may be stale by now
+            return s, cart, total
+
+        def _finish_checkout(self, session, s, cart, total, success):
+            if not success:
+                self._restock(cart)
+                raise PaymentError("Payment failed")
+            order_id = next(self._order_ids)
+            order = {"id":order_id, "items":cart, "total":total, "status":"Confirmed",
+                     "user":s["user"], "created_at":self.clock()}
+            self.orders[order_id] = order
+            self._index_order(order)
+            # empty cart (stock was already taken by _reserve_stock)
+            for iid in cart: self._item_carts[iid].pop(session, None)
+            s["cart"] = {}
+            s["subtotal_parts"] = []
+            s["orders"].append(order_id)
             return order_id
 
         def cancel_order(self, order_id):
             if order_id not in self.orders: raise ValueError("Invalid order")
             order = self.orders[order_id]
-            if order["status"] == "Cancelled": return False
-            for iid,q in order["items"].items(): self.items[iid]["stock"] += q
-            order["status"] = "Cancelled"
+            with self._guard if self.thread_safe else nullcontext():
+                if order["status"] == "Cancelled": return False
+                key = (order["created_at"], order_id)
+                by_status = self._orders_by_status[order["status"]]
+                del by_status[bisect_left(by_status, key)]
+                order["status"] = "Cancelled"
+                insort(self._orders_by_status.setdefault("Cancelled", []), key)
+            self._restock(order["items"])
             return True
 
+        def _stock_lock(self, item_id):
+            lock = self._stock_locks.get(item_id)
+            if lock is None:
+                with self._guard: lock = self._stock_locks.setdefault(item_id, threading.Lock())
+            return lock
+
+        def _locked(self, item_ids):
+            stack = ExitStack()
+            if self.thread_safe:
+                for iid in sorted(item_ids): stack.enter_context(self._stock_lock(iid))
+            return stack
+
+        def _reserve_stock(self, lines):
+            with self._locked(lines):
+                for iid, q in lines.items():
+                    if self.items[iid]["stock"] < q: raise ValueError("Not enough stock")
+                for iid, q in lines.items(): self.items[iid]["stock"] -= q
+
+        def _restock(self, lines):
+            with self._locked(lines):
+                for iid, q in lines.items(): self.items[iid]["stock"] += q
+
         def get_order_status(self, order_id):
             return self.orders.get(order_id, {}).get("status", "Unknown")
+
+        def _index_order(self, order):
+            with self._guard if self.thread_safe else nullcontext():
+                key = (order["created_at"], order["id"])
+                last = self._last_order_key
+                if last is not None and (key[0] < last[0] or key[1] < last[1]): self._ids_in_time_order = False
+                self._last_order_key = key
+                self._orders_by_user.setdefault(order["user"], []).append(order["id"])
+                insort(self._orders_by_status.setdefault(order["status"], []), key)
+                insort(self._orders_by_time, key)
+
+        def find_orders(self, user=None, status=None, since=None, until=None, limit=None):
+            """Orders matching every given filter (created_at within [since, until]), in order-id order.
+
+            Candidates come from the smaller of the per-user list and the (status, created_at)
+            range; the other filters are checked on those orders only, so cost follows the
+            result size, not the number of orders. While ids ascend with created_at (the usual
+            case) the candidates are already in id order and the walk stops at `limit`;
+            otherwise the matches are sorted, or heap-selected when `limit` is given.
+            """
+            user_ids = None if user is None else self._orders_by_user.get(user, [])
+            span = None
+            if status is not None or since is not None or until is not None:
+                times = self._orders_by_time if status is None else self._orders_by_status.get(status, [])
+                lo = 0 if since is None else bisect_left(times, (since,))
+                hi = len(times) if until is None else bisect_right(times, (until, float("inf")))
+                span = (times, lo, max(lo, hi))
+            if user_ids is not None and (span is None or len(user_ids) <= span[2] - span[1]): ids = user_ids
+            else:
+                times, lo, hi = span or (self._orders_by_time, 0, len(self._orders_by_time))
+                ids = (times[i][1] for i in range(lo, hi))      # lazy: a small limit reads a few entries
+            orders = self.orders
+            def matches(oid):
+                o = orders[oid]
+                return ((user is None or o["user"] == user) and (status is None or o["status"] == status)
+                        and (since is None or o["created_at"] >= since) and (until is None or o["created_at"] <= until))
+            hits = filter(matches, ids)
+            if self._ids_in_time_order: hits = itertools.islice(hits, limit)
+            else: hits = sorted(hits) if limit is None else heapq.nsmallest(limit, hits)
+            return [orders[oid] for oid in hits]
+
+        def save_snapshot(self, path):
+            state = {"users": self.users, "sessions": dict(self.sessions.items()), "orders": self.orders,
+                     "session_seq": self._peek_id("_session_ids") - 1, "order_seq": self._peek_id("_order_ids") - 1}
+            snapshot.write_snapshot(path, self.items, state)
+
+        @classmethod
+        def load_snapshot(cls, path, **kwargs):
+            """Site backed by a snapshot file. The catalog is memory-mapped and paged in on
+            access; changes stay in this process (copy-on-write) until save_snapshot()."""
+            catalog, state = snapshot.read_snapshot(path)
+            site = cls(catalog=lambda _defaults: catalog, **kwargs)
+            site.users, site.orders = state["users"], state["orders"]
+            site.sessions.update(state["sessions"])
+            site._session_ids = itertools.count(state["session_seq"] + 1)
+            site._order_ids = itertools.count(state["order_seq"] + 1)
+            site._reindex_state()
+            return site
+
+        def clone(self):
+            """Independent copy of this site that skips __init__ (catalog, coupons, imports).
+
+            Catalog rows are copied on first access through an OverlayCatalog, the search
+            index is shared until the clone adds or renames an item, and the per-run state
+            (users, sessions, orders) is deep-copied. The original is never written to.
+            """
+            c = object.__new__(type(self))
+            c.__dict__.update(self.__dict__)
+            c.items = OverlayCatalog(self.items)
+            c._index_shared = self._index is not None
+            c.users, c.coupons = dict(self.users), dict(self.coupons)
+            c.orders = copy.deepcopy(self.orders)
+            sessions = copy.deepcopy(dict(self.sessions.items()))
+            if isinstance(self.sessions, SessionStore):
+                old = self.sessions
+                c.sessions = SessionStore(ttl=old.ttl, max_size=old.max_size, on_evict=c._drop_session, clock=old.clock)
+                c.sessions.update(sessions)
+            else: c.sessions = sessions
+            c._session_ids = itertools.count(self._peek_id("_session_ids"))
+            c._order_ids = itertools.count(self._peek_id("_order_ids"))
+            c._guard, c._stock_locks = threading.Lock(), {}
+            c._payment_slots = weakref.WeakKeyDictionary()
+            c._reindex_state()
+            return c
+
+        def _reindex_state(self):
+            # rebuild everything derived from sessions/orders: cart reverse index and order indexes
+            self._item_carts, self._orders_by_user, self._orders_by_status, self._orders_by_time = {}, {}, {}, []
+            self._last_order_key, self._ids_in_time_order = None, True
+            for token, s in self.sessions.items():
+                for iid in s["cart"]: self._item_carts.setdefault(iid, {})[token] = s
+            for order in self.orders.values(): self._index_order(order)
+
+        def _peek_id(self, attr):
+            n = next(getattr(self, attr))
+            setattr(self, attr, itertools.count(n))
+            return n
+
+        def _drop_session(self, token, session):
+            # SessionStore eviction hook: forget the cart so price changes stop visiting it
+            for iid in session["cart"]:
+                carts = self._item_carts.get(iid)
+                if carts is not None: carts.pop(token, None)
 ''')
-with open(os.path.join(project_dir, "ecom_module.py"), "w") as f:
-    f.write(ecom_module)
+write_generated("ecom_module.py", ecom_module)
 
 # -------------------------------- Payment_gateway stub ---------------------------------------
 
@@ -101,24 +405,547 @@ def process(payment_details, amount):
     card = payment_details.get("card_number","")
     return card.startswith("4111")
 ''')
-with open(os.path.join(project_dir, "payment_gateway.py"), "w") as f:
-    f.write(payment_gateway)
+write_generated("payment_gateway.py", payment_gateway)
+
+# -------------------------------- Async gateway interface, local stand-in & batcher --------------
+
+async_gateway = textwrap.dedent(r'''
+import asyncio, time, weakref
+import payment_gateway as pg
+
+class ThreadedGateway:
+    """Async face for a sync gateway module/object: runs process() on the default thread pool."""
+    supports_batch = False
+    def __init__(self, gateway): self.gateway = gateway
+    async def authorize(self, payment_details, amount):
+        return await asyncio.to_thread(self.gateway.process, payment_details, amount=amount)
+
+class LocalGateway:
+    """Stand-in remote gateway: payment_gateway.process rules behind a simulated round-trip.
+
+    At most `max_connections` requests are on the wire at once (a connection pool);
+    authorize_batch() pays one round-trip for many payments, like a bulk authorize endpoint.
+    """
+    supports_batch = True
+    def __init__(self, latency=0.05, batch_latency=None, max_connections=10):
+        self.latency = latency
+        self.batch_latency = latency if batch_latency is None else batch_latency
+        self.max_connections = max_connections
+        self._pools = weakref.WeakKeyDictionary()     # event loop -> Semaphore, like ECommerceSite._slots()
+        self.round_trips = 0
+
+    def _connections(self):
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None: pool = self._pools[loop] = asyncio.Semaphore(self.max_connections)
+        return pool
+
+    def process(self, payment_details, amount):
+        time.sleep(self.latency)
+        self.round_trips += 1
+        return pg.process(payment_details, amount=amount)
+
+    async def authorize(self, payment_details, amount):
+        async with self._connections():
+            await asyncio.sleep(self.latency)
+            self.round_trips += 1
+        return pg.process(payment_details, amount=amount)
+
+    async def authorize_batch(self, requests):
+        async with self._connections():
+            await asyncio.sleep(self.batch_latency)
+            self.round_trips += 1
+        return [pg.process(details, amount=amount) for details, amount in requests]
+
+class PaymentBatcher:
+    """Coalesces authorize() calls made within `window` seconds into one authorize_batch().
+
+    Falls back to per-payment authorize() when the wrapped gateway has no batch endpoint.
+    """
+    def __init__(self, gateway, max_batch=50, window=0.005):
+        self.gateway = gateway
+        self.max_batch = max_batch
+        self.window = window
+        self._pending = []
+        self._timer = None
+        self._sending = set()     # strong refs: the loop only keeps weak ones to running tasks
+
+    async def authorize(self, payment_details, amount):
+        if not getattr(self.gateway, "supports_batch", False):
+            return await self.gateway.authorize(payment_details, amount=amount)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((payment_details, amount, fut))
+        if len(self._pending) >= self.max_batch: self._flush()
+        elif self._timer is None: self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch):
+        try: results = await self.gateway.authorize_batch([(d, a) for d, a, _ in batch])
+        except Exception as e:
+            for _, _, fut in batch:
+                if not fut.done(): fut.set_exception(e)
+            return
+        for (_, _, fut), ok in zip(batch, results):
+            if not fut.done(): fut.set_result(ok)
+''')
+write_generated("async_gateway.py", async_gateway)
+
+# -------------------------------- Columnar catalog backend ---------------------------------------
+
+columnar_catalog = textwrap.dedent(r'''
+from array import array
+from collections.abc import MutableMapping
+
+class ItemRow(MutableMapping):
+    """Live view of one catalog row; reads and writes go straight to the columns."""
+    __slots__ = ("_cat", "_row")
+    FIELDS = ("name", "price", "stock")
+
+    def __init__(self, cat, row): self._cat, self._row = cat, row
+
+    def __getitem__(self, key):
+        if key == "price": return self._cat.prices[self._row]
+        if key == "stock": return self._cat.stocks[self._row]
+        if key == "name": return self._cat.name_at(self._row)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "price": self._cat.prices[self._row] = value
+        elif key == "stock": self._cat.stocks[self._row] = value
+        elif key == "name": self._cat.set_name(self._row, value)
+        else: raise KeyError(key)
+
+    def __delitem__(self, key): raise TypeError("catalog rows have fixed fields")
+    def __iter__(self): return iter(self.FIELDS)
+    def __len__(self): return len(self.FIELDS)
+    def __repr__(self): return repr(dict(self))
+
+class ColumnarCatalog(MutableMapping):
+    """Drop-in for the items dict-of-dicts that keeps `items[id]["price"]` working.
+
+    Prices and stock live in typed arrays, names in one UTF-8 string table addressed by
+    (offset, length), and ids map to rows through a single id -> row dict. Iteration
+    follows insertion order like a dict. Rows can be added and changed, not deleted.
+    dedupe_names=True stores each distinct name once, at the cost of a name -> offset dict;
+    it pays off when many SKUs share a name (sizes/colours), not for unique names.
+    """
+    def __init__(self, items=(), dedupe_names=False):
+        self.ids = array("q")
+        self.prices = array("d")
+        self.stocks = array("q")
+        self.name_offsets = array("Q")
+        self.name_lengths = array("L")
+        self.names = bytearray()
+        self._rows = {}
+        self._interned = {} if dedupe_names else None      # name bytes -> offset
+        for item_id, fields in dict(items).items(): self[item_id] = fields
+
+    def _intern(self, name):
+        raw = name.encode("utf-8")
+        off = None if self._interned is None else self._interned.get(raw)
+        if off is None:
+            off = len(self.names)
+            self.names += raw
+            if self._interned is not None: self._interned[raw] = off
+        return off, len(raw)
+
+    def name_at(self, row):
+        off = self.name_offsets[row]
+        return str(self.names[off:off + self.name_lengths[row]], "utf-8")
+
+    def set_name(self, row, name):
+        self.name_offsets[row], self.name_lengths[row] = self._intern(name)
+
+    def row_of(self, item_id): return self._rows[item_id]
+
+    def __getitem__(self, item_id): return ItemRow(self, self._rows[item_id])
+
+    def __setitem__(self, item_id, fields):
+        row = self._rows.get(item_id)
+        if row is None:
+            self._rows[item_id] = len(self.ids)
+            off, n = self._intern(fields["name"])
+            self.ids.append(item_id)
+            self.prices.append(fields["price"])
+            self.stocks.append(fields["stock"])
+            self.name_offsets.append(off)
+            self.name_lengths.append(n)
+        else:
+            view = ItemRow(self, row)
+            for key in ItemRow.FIELDS: view[key] = fields[key]
+
+    def __delitem__(self, item_id): raise TypeError("ColumnarCatalog does not support deleting items")
+    def __contains__(self, item_id): return item_id in self._rows
+    def __iter__(self): return iter(self.ids)
+    def __len__(self): return len(self.ids)
+
+    def price_of(self, item_id): return self.prices[self._rows[item_id]]
+    def stock_of(self, item_id): return self.stocks[self._rows[item_id]]
+''')
+write_generated("columnar_catalog.py", columnar_catalog)
+
+# -------------------------------- Copy-on-access catalog overlay (used by ECommerceSite.clone) ------
+
+overlay_catalog = textwrap.dedent(r'''
+from collections.abc import MutableMapping
+
+class OverlayCatalog(MutableMapping):
+    """Catalog view over a base mapping that is never written to.
+
+    A row is copied into the overlay the first time it is read, so callers can mutate
+    `items[id]["stock"]` freely; rows nobody touches are never copied. New ids live only
+    in the overlay. Iteration keeps the base order, then overlay-only ids.
+    """
+    def __init__(self, base): self._base, self._own = base, {}
+
+    def __getitem__(self, item_id):
+        row = self._own.get(item_id)
+        if row is None: row = self._own[item_id] = dict(self._base[item_id])
+        return row
+
+    def __setitem__(self, item_id, fields): self._own[item_id] = dict(fields)
+    def __delitem__(self, item_id): raise TypeError("OverlayCatalog does not support deleting items")
+    def __contains__(self, item_id): return item_id in self._own or item_id in self._base
+    def __iter__(self):
+        yield from self._base
+        yield from (i for i in self._own if i not in self._base)
+    def __len__(self): return len(self._base) + sum(1 for i in self._own if i not in self._base)
+''')
+write_generated("overlay_catalog.py", overlay_catalog)
+
+# -------------------------------- Session store (idle TTL + LRU cap) ------------------------------
+
+session_store = textwrap.dedent(r'''
+import threading, time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+class SessionStore(MutableMapping):
+    """Bounded token -> session mapping with idle TTL and LRU eviction.
+
+    Entries are kept in recency order, so a read is an O(1) move-to-end and the
+    least recently used / longest idle entry is always at the front. Expiry is lazy:
+    no background thread, expired entries are dropped when read or when a write
+    sweeps the front. `on_evict(token, session)` runs for every entry that leaves
+    because of TTL or size (not for explicit `del`). `stats` counts hits, misses,
+    evictions (size) and expirations (TTL).
+    """
+    def __init__(self, ttl=None, max_size=None, on_evict=None, clock=time.monotonic):
+        self.ttl, self.max_size, self.on_evict, self.clock = ttl, max_size, on_evict, clock
+        self._data = OrderedDict()       # token -> [session, last_seen]
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def _expired(self, entry, now): return self.ttl is not None and now - entry[1] > self.ttl
+
+    def _remove(self, token, reason):
+        session, _ = self._data.pop(token)
+        self.stats[reason] += 1
+        if self.on_evict is not None: self.on_evict(token, session)
+
+    def __getitem__(self, token):
+        with self._lock:
+            entry = self._data.get(token)
+            now = self.clock()
+            if entry is None or self._expired(entry, now):
+                if entry is not None: self._remove(token, "expirations")
+                self.stats["misses"] += 1
+                raise KeyError(token)
+            entry[1] = now
+            self._data.move_to_end(token)
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def __contains__(self, token):
+        # membership doesn't touch recency or stats; expired entries read as absent
+        entry = self._data.get(token)
+        return entry is not None and not self._expired(entry, self.clock())
+
+    def __setitem__(self, token, session):
+        with self._lock:
+            now = self.clock()
+            self._data[token] = [session, now]
+            self._data.move_to_end(token)
+            self.expire(now)
+            while self.max_size is not None and len(self._data) > self.max_size:
+                self._remove(next(iter(self._data)), "evictions")
+
+    def __delitem__(self, token):
+        with self._lock: del self._data[token]
+
+    def expire(self, now=None):
+        """Drop idle entries from the LRU end; stops at the first live one."""
+        if self.ttl is None: return
+        with self._lock:
+            now = self.clock() if now is None else now
+            while self._data:
+                token, entry = next(iter(self._data.items()))
+                if not self._expired(entry, now): break
+                self._remove(token, "expirations")
+
+    def items(self):
+        """Live (token, session) pairs, oldest first, without counting as access."""
+        now = self.clock()
+        with self._lock: return [(t, e[0]) for t, e in self._data.items() if not self._expired(e, now)]
+
+    def __iter__(self): return iter([t for t, _ in self.items()])
+    def __len__(self):
+        # the sweep leaves only live entries (recency order is last_seen order), so this agrees with items()
+        with self._lock:
+            self.expire()
+            return len(self._data)
+''')
+write_generated("session_store.py", session_store)
+
+# -------------------------------- Snapshot files (mmap-backed catalog + pickled state) ------------
+
+snapshot = textwrap.dedent(r'''
+"""On-disk snapshot of an ECommerceSite.
+
+Layout: MAGIC | u64 header length | JSON header | 8-byte aligned sections. The catalog is
+stored as raw ColumnarCatalog columns plus an id-sorted (id, row) index, so a reader can
+mmap the file and find any row by binary search without building anything up front.
+Users, sessions and orders follow as one pickle section (trusted files only).
+"""
+import json, mmap, pickle, struct, sys
+from array import array
+from bisect import bisect_left
+from columnar_catalog import ColumnarCatalog
+
+MAGIC = b"ECOMSNP1"
+COLUMNS = (("ids", "q"), ("prices", "d"), ("stocks", "q"), ("name_offsets", "Q"), ("name_lengths", "L"),
+           ("sorted_ids", "q"), ("sorted_rows", "q"))
+
+class _SortedIdIndex:
+    """id -> row over mmapped sorted columns; rows added after loading live in `extra`."""
+    def __init__(self, ids, rows):
+        self.ids, self.rows, self.extra = ids, rows, {}
+
+    def get(self, item_id, default=None):
+        pos = bisect_left(self.ids, item_id)
+        if pos < len(self.ids) and self.ids[pos] == item_id: return self.rows[pos]
+        return self.extra.get(item_id, default)
+
+    def __getitem__(self, item_id):
+        row = self.get(item_id)
+        if row is None: raise KeyError(item_id)
+        return row
+
+    def __contains__(self, item_id): return self.get(item_id) is not None
+    def __setitem__(self, item_id, row): self.extra[item_id] = row
+
+class MappedCatalog(ColumnarCatalog):
+    """ColumnarCatalog whose columns are views into a memory-mapped snapshot.
+
+    Reads and in-place price/stock updates touch only the pages they need (the map is
+    copy-on-write, the file never changes). Adding rows or renaming copies the columns
+    into ordinary arrays first.
+    """
+    def __init__(self, mm, header, base):
+        self._mm = mm
+        view = memoryview(mm)
+        for name, typecode in COLUMNS:
+            off, n = header["columns"][name]
+            setattr(self, name, view[base+off:base+off+n].cast(typecode))
+        off, n = header["names"]
+        self.names = view[base+off:base+off+n]
+        self._rows = _SortedIdIndex(self.sorted_ids, self.sorted_rows)
+        self._interned = None
+        self._mapped = True
+
+    def _thaw(self):
+        if not self._mapped: return
+        for name, typecode in COLUMNS[:5]: setattr(self, name, array(typecode, getattr(self, name)))
+        self.names = bytearray(self.names)
+        self._mapped = False
+
+    def __setitem__(self, item_id, fields):
+        if item_id not in self._rows: self._thaw()
+        super().__setitem__(item_id, fields)
+
+    def set_name(self, row, name):
+        self._thaw()
+        super().set_name(row, name)
+
+def _pad(n): return -n % 8
+
+def write_snapshot(path, items, state):
+    cat = items if isinstance(items, ColumnarCatalog) else ColumnarCatalog(items)
+    order = sorted(range(len(cat.ids)), key=cat.ids.__getitem__)
+    cols = {name: array(tc, getattr(cat, name)) for name, tc in COLUMNS[:5]}
+    cols["sorted_ids"] = array("q", (cat.ids[r] for r in order))
+    cols["sorted_rows"] = array("q", order)
+    blobs, layout, pos = [], {}, 0
+    for name, _ in COLUMNS:
+        raw = cols[name].tobytes()
+        layout[name] = [pos, len(raw)]
+        blobs.append(raw + b"\0" * _pad(len(raw)))
+        pos += len(raw) + _pad(len(raw))
+    names = bytes(cat.names)
+    state_raw = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    header = {"byteorder": sys.byteorder, "itemsizes": {tc: array(tc).itemsize for _, tc in COLUMNS},
+              "columns": layout, "names": [pos, len(names)], "state": [pos + len(names), len(state_raw)]}
+    head = json.dumps(header).encode()
+    head += b" " * _pad(len(MAGIC) + 8 + len(head))
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(head)) + head)
+        for blob in blobs: f.write(blob)
+        f.write(names)
+        f.write(state_raw)
+
+def read_snapshot(path):
+    """Returns (MappedCatalog, state dict)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC: raise ValueError("Not an ecom snapshot")
+        (n,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(n))
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if header["byteorder"] != sys.byteorder or any(array(tc).itemsize != size for tc, size in header["itemsizes"].items()):
+        raise ValueError("Snapshot was written on an incompatible platform")
+    base = len(MAGIC) + 8 + n
+    off, size = header["state"]
+    state = pickle.loads(mm[base+off:base+off+size])
+    return MappedCatalog(mm, header, base), state
+''')
+write_generated("snapshot.py", snapshot)
+
+# -------------------------------- Search index (n-gram + token postings) ----------------------
+
+search_index = textwrap.dedent(r'''
+import heapq, re
+from itertools import islice
+
+class SearchIndex:
+    """Incrementally maintained name index for ECommerceSite.search.
+
+    Names are lowercased once on insert. Queries of at least `n` chars intersect the
+    n-gram postings and verify the survivors with `q in name`, so results are exactly
+    the old substring scan, in catalog order. Shorter queries scan the pre-lowered names.
+    """
+    def __init__(self, n=3):
+        self.n = n
+        self._names = {}      # item_id -> lowercased name
+        self._rank = {}       # item_id -> insertion rank
+        self._seq = 0
+        self._grams = {}      # n-gram -> set(item_id)
+        self._tokens = {}     # word token -> set(item_id)
+
+    def __len__(self): return len(self._names)
+
+    def copy(self):
+        new = SearchIndex(self.n)
+        new._names, new._rank, new._seq = dict(self._names), dict(self._rank), self._seq
+        new._grams = {g: set(ids) for g, ids in self._grams.items()}
+        new._tokens = {t: set(ids) for t, ids in self._tokens.items()}
+        return new
+
+    def _grams_of(self, text):
+        n = self.n
+        return {text[i:i+n] for i in range(len(text)-n+1)}
+
+    def add(self, item_id, name):
+        if item_id in self._names: self._unlink(item_id)
+        else:
+            self._seq += 1
+            self._rank[item_id] = self._seq
+        low = name.lower()
+        self._names[item_id] = low
+        for g in self._grams_of(low): self._grams.setdefault(g, set()).add(item_id)
+        for t in re.findall(r"\w+", low): self._tokens.setdefault(t, set()).add(item_id)
+
+    def remove(self, item_id):
+        if item_id not in self._names: return
+        self._unlink(item_id)
+        del self._names[item_id], self._rank[item_id]
+
+    def _unlink(self, item_id):
+        low = self._names[item_id]
+        for postings, keys in ((self._grams, self._grams_of(low)), (self._tokens, re.findall(r"\w+", low))):
+            for k in keys:
+                ids = postings.get(k)
+                if ids is None: continue
+                ids.discard(item_id)
+                if not ids: del postings[k]
+
+    def _intersect(self, postings, keys):
+        sets = sorted((postings.get(k, ()) for k in keys), key=len)
+        if not sets or not sets[0]: return set()
+        hits = set(sets[0])
+        for ids in sets[1:]:
+            hits &= ids
+            if not hits: break
+        return hits
+
+    def _select(self, postings, keys, matches, verify, limit, where):
+        # ids in every posting list of `keys` that pass verify (and where), in catalog order, at most `limit`
+        if limit is not None:
+            # broad queries have dense hits, so walking the catalog in order finds `limit` of them in a few
+            # steps; give up after as many steps as the smallest posting list, the postings path's own floor
+            budget = min((len(postings.get(k, ())) for k in keys), default=0)
+            test = matches if where is None else (lambda i: matches(i) and where(i))
+            found = list(islice(filter(test, islice(self._rank, budget)), limit))
+            if len(found) == limit: return found
+        hits = self._intersect(postings, keys)
+        if verify is not None: hits = filter(verify, hits)
+        if where is not None: hits = filter(where, hits)
+        if limit is None: return sorted(hits, key=self._rank.__getitem__)
+        return heapq.nsmallest(limit, hits, key=self._rank.__getitem__)     # top ranks without sorting every hit
+
+    def query(self, text, limit=None, where=None):
+        """Ids whose name contains `text` (case-insensitive), in catalog order. With `limit`, only the
+        first `limit` of them; `where(id)` filters before the limit is counted."""
+        q = text.lower()
+        names = self._names
+        if len(q) < self.n:
+            hits = (i for i, name in names.items() if q in name)
+            return list(islice(hits if where is None else filter(where, hits), limit))
+        contains = lambda i: q in names[i]
+        return self._select(self._grams, self._grams_of(q), contains, contains, limit, where)
+
+    def tokens(self, text, limit=None, where=None):
+        """Ids whose name contains every word of `text` as a whole word, in catalog order (limit/where as in query)."""
+        words = set(re.findall(r"\w+", text.lower()))
+        if not words: return []
+        postings = self._tokens
+        has_all = lambda i: all(i in postings.get(w, ()) for w in words)
+        return self._select(postings, words, has_all, None, limit, where)
+''')
+write_generated("search_index.py", search_index)
 
 # -------------------------------- conftest & fixture setup-------------------------------
 conftest = textwrap.dedent(r'''
-import pytest
+import os, pytest
 from ecom_module import ECommerceSite
 
+# ECOM_SITE_FIXTURE=fresh builds ECommerceSite() per test; the default clones one pristine site
+@pytest.fixture(scope="session")
+def pristine_site():
+    site = ECommerceSite()
+    site._search_index()          # built once, shared by every clone until it renames/adds items
+    return site
+
 @pytest.fixture
-def site(): return ECommerceSite()
+def site(request):
+    if os.environ.get("ECOM_SITE_FIXTURE") == "fresh": return ECommerceSite()
+    return request.getfixturevalue("pristine_site").clone()
 
 @pytest.fixture
 def logged_in(site):
     token = site.login("alice","alicepwd")
     return site, token
 ''')
-with open(os.path.join(project_dir, "conftest.py"), "w") as f:
-    f.write(conftest)
+write_generated("conftest.py", conftest)
 
 # ------------------------ tests: SMOKE, SANITY, REGRESSION ---------------------
 
@@ -140,8 +967,7 @@ def test_search_returns_results(site):
     results = site.search("smartphone")
     assert any("Smartphone" in r["name"] for r in results)
 ''')
-with open(os.path.join(project_dir, "test_smoke.py"), "w") as f:
-    f.write(test_smoke)
+write_generated("test_smoke.py", test_smoke)
 
 # ----- SANITY
 
@@ -168,14 +994,26 @@ def test_checkout_creates_order_and_clears_cart(logged_in):
     order_id = site.checkout(token, {"card_number":"4111222233334444"})
     assert site.get_order_status(order_id) == "Confirmed"
     assert site.cart_total(token) == 0
+
+@pytest.mark.sanity
+def test_price_change_refreshes_open_carts(logged_in):
+    site, token = logged_in
+    site.add_to_cart(token, 1, qty=1)
+    site.add_to_cart(token, 5, qty=3)
+    site.update_item(5, price=249.0)
+    assert site.cart_total(token) == pytest.approx(15000.0 + 3*249.0)
 ''')
-with open(os.path.join(project_dir, "test_sanity.py"), "w") as f:
-    f.write(test_sanity)
+write_generated("test_sanity.py", test_sanity)
 
 # ----- REGRESSION
 
 test_regression = textwrap.dedent(r'''
-import pytest
+import asyncio, pytest, tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from async_gateway import LocalGateway, PaymentBatcher
+from columnar_catalog import ColumnarCatalog
+from ecom_module import ECommerceSite, PaymentError
+from session_store import SessionStore
 
 @pytest.mark.regression
 def test_search_excludes_out_of_stock(site):
@@ -202,16 +1040,693 @@ def test_order_cancellation_restocks_items(logged_in):
     cancelled = site.cancel_order(order_id)
     assert cancelled is True
     assert site.items[3]["stock"] == 5
+
+@pytest.mark.regression
+def test_search_in_stock_filter_and_limit(site):
+    assert [r["id"] for r in site.search("phone")] == [1, 5]
+    assert site.search("earbuds", in_stock=True) == []
+    assert len(site.search("o", limit=2)) == 2
+    assert [r["id"] for r in site.search("pro", whole_word=True)] == [1]
+
+@pytest.mark.regression
+def test_search_index_matches_substring_scan(site):
+    site.add_item(6, "Smartwatch Lite", 4999.0, stock=7)
+    for q in ["", "a", "PH", "phone", "Smart", "e b", "cover - blue", "zzz"]:
+        expected = [i for i,m in site.items.items() if q.lower() in m["name"].lower()]
+        assert [r["id"] for r in site.search(q)] == expected
+    site.update_item(6, name="Fitness Band")
+    assert [r["id"] for r in site.search("smart")] == [1]
+    assert [r["id"] for r in site.search("band")] == [6]
+
+@pytest.mark.regression
+def test_limited_search_is_a_prefix_of_the_full_result(site):
+    import random
+    rnd = random.Random(3)
+    words = ["smart", "phone", "coffee", "blue", "pro", "lite", "band"]
+    for i in range(6, 2006): site.add_item(i, " ".join(rnd.sample(words, 2)) + f" {i}", 100.0, stock=rnd.randint(0, 3))
+    site.update_item(7, name="Rare Gadget")
+    site.update_item(1500, name="rare gadget xl")
+    for q in ["phone", "blue pro", "rare", "gadget", "199", "ph", "zzz"]:
+        for in_stock in (False, True):
+            for whole_word in (False, True):
+                full = [r["id"] for r in site.search(q, in_stock=in_stock, whole_word=whole_word)]
+                for limit in (1, 3, 50):
+                    assert [r["id"] for r in site.search(q, in_stock, limit, whole_word)] == full[:limit]
+
+@pytest.mark.regression
+def test_running_subtotal_equals_full_recomputation(logged_in):
+    from fractions import Fraction
+    site, token = logged_in
+    def exact():   # correctly rounded sum of the line values, without the interpreter's sum()
+        return float(sum(Fraction(site.items[i]["price"]*n) for i,n in site.sessions[token]["cart"].items()))
+    for i, price in enumerate([0.1, 0.2, 0.3, 1e16, 19.99, 3.3333], start=10):
+        site.add_item(i, f"Item {i}", price, stock=50)
+    for iid, q in [(10,3), (11,1), (12,7), (13,1), (10,2), (14,5), (15,3), (13,2), (11,4)]:
+        site.add_to_cart(token, iid, qty=q)
+        assert site.cart_total(token) == exact()   # exact, not approx
+    site.update_item(12, price=0.7)
+    site.update_item(13, price=2.5)
+    assert site.cart_total(token) == exact()
+    other = site.login("alice","alicepwd")
+    for i in range(20, 30):
+        site.add_item(i, f"Dime {i}", 0.1, stock=5)
+        site.add_to_cart(other, i)
+    assert site.cart_total(other) == 1.0
+
+@pytest.mark.regression
+def test_checkout_revalidates_stock():
+    site = ECommerceSite()
+    a, b = site.login("alice","alicepwd"), site.login("alice","alicepwd")
+    site.add_to_cart(a, 4, qty=3)
+    site.add_to_cart(b, 4, qty=3)
+    site.checkout(a, {"card_number":"4111000011112222"})
+    with pytest.raises(ValueError):
+        site.checkout(b, {"card_number":"4111000011112222"})
+    assert site.items[4]["stock"] == 0
+
+@pytest.mark.regression
+def test_failed_payment_releases_reserved_stock(logged_in):
+    site, token = logged_in
+    site.add_to_cart(token, 4, qty=2)
+    with pytest.raises(PaymentError):
+        site.checkout(token, {"card_number":"5500000000000004"})
+    assert site.items[4]["stock"] == 3
+
+@pytest.mark.regression
+def test_concurrent_checkout_never_oversells():
+    site = ECommerceSite(thread_safe=True)
+    site.add_item(50, "Limited Drop Sneaker", 9999.0, stock=40)
+    tokens = [site.login("alice","alicepwd") for _ in range(200)]
+    for t in tokens:
+        site.add_to_cart(t, 50, qty=1)
+        site.add_to_cart(t, 5, qty=1)
+    results = []
+    def buy(t):
+        try: results.append(site.checkout(t, {"card_number":"4111000011112222"}))
+        except ValueError: pass
+    with ThreadPoolExecutor(max_workers=16) as pool: list(pool.map(buy, tokens))
+    assert len(results) == len(set(results)) == 40          # unique order ids, exactly the stock sold
+    assert site.items[50]["stock"] == 0 and site.items[5]["stock"] == 60
+    for oid in results[:10]: site.cancel_order(oid)
+    with ThreadPoolExecutor(max_workers=8) as pool: list(pool.map(site.cancel_order, results[:10]))
+    assert site.items[50]["stock"] == 10
+
+@pytest.mark.regression
+def test_async_checkout_overlaps_and_batches_payments():
+    site = ECommerceSite(max_in_flight=8)
+    gateway = LocalGateway(latency=0.02)
+    site.async_gateway = PaymentBatcher(gateway, max_batch=10)
+    tokens = [site.login("alice","alicepwd") for _ in range(30)]
+    for t in tokens: site.add_to_cart(t, 5, qty=1)
+    cards = ["4111000011112222" if n % 3 else "5500000000000004" for n in range(30)]
+    async def main():
+        return await asyncio.gather(*(site.checkout_async(t, {"card_number":c}) for t,c in zip(tokens, cards)), return_exceptions=True)
+    results = asyncio.run(main())
+    assert sum(isinstance(r, PaymentError) for r in results) == 10
+    assert len({r for r in results if isinstance(r, int)}) == 20
+    assert site.items[5]["stock"] == 80          # declined payments gave their stock back
+    assert gateway.round_trips < 30              # payments went out in batches
+
+@pytest.mark.regression
+def test_async_checkout_works_across_event_loops():
+    # each asyncio.run() is a new loop; the semaphores must not stay bound to the first one
+    site = ECommerceSite(max_in_flight=2)
+    gateway = LocalGateway(latency=0.01, max_connections=2)
+    site.async_gateway = PaymentBatcher(gateway, max_batch=3)
+    for _ in range(2):
+        tokens = [site.login("alice","alicepwd") for _ in range(6)]
+        for t in tokens: site.add_to_cart(t, 5, qty=1)
+        async def main():
+            return await asyncio.gather(*(site.checkout_async(t, {"card_number":"4111000011112222"}) for t in tokens))
+        assert len(set(asyncio.run(main()))) == 6
+    assert site.items[5]["stock"] == 88 and not site.async_gateway._sending
+
+@pytest.mark.regression
+def test_async_checkout_defaults_to_sync_gateway(logged_in):
+    site, token = logged_in
+    site.add_to_cart(token, 4, qty=1)
+    order_id = asyncio.run(site.checkout_async(token, {"card_number":"4111222233334444"}))
+    assert site.get_order_status(order_id) == "Confirmed"
+
+@pytest.mark.regression
+def test_columnar_catalog_behaves_like_dict_catalog():
+    plain, cols = ECommerceSite(), ECommerceSite(catalog=ColumnarCatalog)
+    for site in (plain, cols):
+        site.add_item(6, "Phone Cover - Blue", 349.0, stock=2)
+        site.update_item(3, name="Laptop Alpha 2", price=52000.0)
+        token = site.login("alice","alicepwd")
+        site.add_to_cart(token, 3, qty=2)
+        site.add_to_cart(token, 6, qty=1)
+        site.cancel_order(site.checkout(token, {"card_number":"4111000011112222"}))
+        site.add_to_cart(token, 1, qty=1)
+    assert cols.search("phone") == plain.search("phone")
+    assert {i: dict(m) for i,m in cols.items.items()} == plain.items
+    assert cols.cart_total("session_1") == plain.cart_total("session_1")
+    assert cols.items.price_of(3) == 52000.0 and cols.items.stock_of(4) == 3
+    shared = ColumnarCatalog(plain.items, dedupe_names=True)
+    assert shared.name_offsets[shared.row_of(6)] == shared.name_offsets[shared.row_of(5)]
+    assert shared[6]["name"] == "Phone Cover - Blue"
+
+@pytest.mark.regression
+def test_batch_cart_apis_match_scalar_calls():
+    scalar, batch = ECommerceSite(), ECommerceSite()
+    for site in (scalar, batch):
+        tokens = [site.login("alice","alicepwd") for _ in range(20)]    # same tokens on both sites
+    rows = []
+    for n, t in enumerate(tokens):
+        rows += [(t, [1,3,4,5][n % 4], 1 + n % 3), (t, 5, 2), (t, 4, 1)]
+    for row in rows: scalar.add_to_cart(*row)
+    batch.add_to_cart_many(rows)
+    for site in (scalar, batch): site.update_item(5, price=279.5)
+    assert batch.cart_totals(tokens) == [scalar.cart_total(t) for t in tokens]
+    for code in ("FLAT50", "PERC10"):
+        assert batch.preview_coupons(tokens, code) == [scalar.apply_coupon(t, code) for t in tokens]
+    assert "last_coupon" not in batch.sessions[tokens[0]]
+    with pytest.raises(ValueError):
+        batch.add_to_cart_many([(tokens[0], 1, 1), (tokens[0], 2, 1)])   # item 2 is out of stock
+    assert batch.sessions[tokens[0]]["cart"] == scalar.sessions[tokens[0]]["cart"]
+
+@pytest.mark.regression
+@pytest.mark.parametrize("catalog", [dict, ColumnarCatalog])
+def test_snapshot_round_trip(tmp_path, catalog):
+    site = ECommerceSite(catalog=catalog)
+    site.add_item(6, "Smartwatch Lite", 4999.5, stock=7)
+    a, b = site.login("alice","alicepwd"), site.login("alice","alicepwd")
+    site.add_to_cart(a, 6, qty=2)
+    site.cancel_order(site.checkout(a, {"card_number":"4111000011112222"}))
+    site.add_to_cart(a, 1, qty=1)
+    site.add_to_cart(b, 5, qty=3)
+    path = tmp_path / "site.snap"
+    site.save_snapshot(path)
+    before = path.read_bytes()
+
+    loaded = ECommerceSite.load_snapshot(path)
+    assert {i: dict(m) for i,m in loaded.items.items()} == {i: dict(m) for i,m in site.items.items()}
+    assert loaded.orders == site.orders and loaded.sessions == site.sessions
+    assert loaded.search("smart") == site.search("smart")
+    assert loaded.cart_totals([a, b]) == site.cart_totals([a, b])
+    # the loaded site keeps working; its changes never leak into the file
+    loaded.update_item(5, price=199.0)
+    assert loaded.cart_total(b) == pytest.approx(3*199.0)
+    order_id = loaded.checkout(b, {"card_number":"4111000011112222"})
+    assert order_id == 2 and loaded.items[5]["stock"] == 97
+    assert loaded.login("alice","alicepwd") == "session_3"
+    loaded.add_item(7, "Yoga Mat", 899.0, stock=4)
+    loaded.update_item(1, name="Smartphone X Pro Max")
+    assert [r["id"] for r in loaded.search("x pro")] == [1]
+    assert path.read_bytes() == before
+
+@pytest.mark.regression
+def test_session_store_ttl_lru_and_metrics():
+    now = [0.0]
+    dropped = []
+    store = SessionStore(ttl=10, max_size=3, on_evict=lambda t, s: dropped.append(t), clock=lambda: now[0])
+    for t in "abc": store[t] = {"user": t}
+    assert store["a"] == {"user": "a"}           # touch: b is now least recently used
+    store["d"] = {"user": "d"}
+    assert "b" not in store and dropped == ["b"]
+    now[0] = 5.0
+    store["a"]
+    now[0] = 12.0                                # c, d idle for 12s; a only 7s
+    with pytest.raises(KeyError): store["c"]
+    store["e"] = {"user": "e"}                   # write sweeps the expired front
+    assert sorted(store) == ["a", "e"]
+    assert store.stats == {"hits": 2, "misses": 1, "evictions": 1, "expirations": 2}
+    now[0] = 18.0                                # a idle 13s, e 6s: len agrees with iteration
+    assert len(store) == len(list(store)) == len(store.items()) == 1
+
+@pytest.mark.regression
+def test_checkout_survives_session_eviction_during_payment():
+    site = ECommerceSite(max_sessions=2)
+    token = site.login("alice","alicepwd")
+    site.add_to_cart(token, 4, qty=2)
+    class EvictingGateway:
+        def process(self, payment_details, amount):
+            for _ in range(2): site.login("alice","alicepwd")   # pushes `token` out of the store
+            return True
+    site.payment_gateway = EvictingGateway()
+    order_id = site.checkout(token, {"card_number":"4111000011112222"})
+    assert token not in site.sessions
+    assert site.orders[order_id]["user"] == "alice" and site.items[4]["stock"] == 1
+
+@pytest.mark.regression
+def test_bounded_sessions_under_login_storm():
+    site = ECommerceSite(max_sessions=1000, session_ttl=3600)
+    site.add_to_cart(site.login("alice","alicepwd"), 5, qty=1)
+    tracemalloc.start()
+    for _ in range(5_000): site.login("alice","alicepwd")
+    grown = tracemalloc.get_traced_memory()[0]
+    for _ in range(20_000): site.login("alice","alicepwd")
+    more = tracemalloc.get_traced_memory()[0] - grown
+    tracemalloc.stop()
+    assert len(site.sessions) == 1000 and site.sessions.stats["evictions"] == 25_001 - 1000
+    assert more < 64 * 1024                          # 4x the logins, flat memory
+    assert site._item_carts[5] == {}                 # evicted cart left the reverse index
+    site.update_item(5, price=10.0)
+
+@pytest.mark.regression
+def test_order_indexes_follow_checkout_and_cancel():
+    site = ECommerceSite()
+    site.users["bob"] = "bobpwd"
+    now = [1000.0]
+    site.clock = lambda: now[0]
+    placed = []
+    for n, user in enumerate(["alice", "bob", "alice", "bob", "alice"]):
+        token = site.login(user, f"{user}pwd")
+        site.add_to_cart(token, 5, qty=1)
+        now[0] += 60
+        placed.append(site.checkout(token, {"card_number":"4111000011112222"}))
+    site.cancel_order(placed[2])
+    ids = lambda orders: [o["id"] for o in orders]
+    assert ids(site.find_orders(user="alice")) == [placed[0], placed[2], placed[4]]
+    assert ids(site.find_orders(user="alice", status="Confirmed")) == [placed[0], placed[4]]
+    assert ids(site.find_orders(status="Cancelled")) == [placed[2]]
+    assert ids(site.find_orders(since=1120.0, until=1240.0)) == placed[1:4]
+    assert ids(site.find_orders(user="bob", since=1200.0)) == [placed[3]]
+    assert ids(site.find_orders(limit=2)) == placed[:2]
+    assert site.find_orders(user="carol") == []
+    expected = [o for o in site.orders.values() if o["user"] == "alice" and o["created_at"] >= 1180.0]
+    assert site.find_orders(user="alice", since=1180.0) == expected
+    now[0] = 500.0                                   # clock stepped back: time order is no longer id order
+    token = site.login("bob", "bobpwd")
+    site.add_to_cart(token, 5, qty=1)
+    late = site.checkout(token, {"card_number":"4111000011112222"})
+    assert ids(site.find_orders(limit=2)) == placed[:2] and ids(site.find_orders(user="bob")) == [placed[1], placed[3], late]
+    assert ids(site.find_orders(status="Confirmed")) == [placed[0], placed[1], placed[3], placed[4], late]
+
+@pytest.mark.regression
+@pytest.mark.parametrize("opts", [{}, {"catalog": ColumnarCatalog, "max_sessions": 10}])
+def test_clone_is_isolated_from_pristine_and_siblings(opts):
+    pristine = ECommerceSite(**opts)
+    pristine._search_index()
+    pristine_token = pristine.login("alice","alicepwd")
+    pristine.add_to_cart(pristine_token, 5, qty=1)
+    a, b = pristine.clone(), pristine.clone()
+    token = a.login("alice","alicepwd")
+    a.add_to_cart(token, 3, qty=2)
+    a.add_to_cart(pristine_token, 5, qty=1)
+    a.checkout(token, {"card_number":"4111000011112222"})
+    a.add_item(6, "Smartwatch Lite", 4999.0, stock=3)
+    a.update_item(1, name="Feature Phone", price=999.0)
+    a.users["bob"] = "bobpwd"
+    assert a.items[3]["stock"] == 3 and [r["id"] for r in a.search("phone")] == [1, 5]
+    for other in (pristine, b):
+        assert other.items[3]["stock"] == 5 and other.items[1]["name"] == "Smartphone X Pro"
+        assert 6 not in other.items and other.orders == {} and "bob" not in other.users
+        assert [r["id"] for r in other.search("smart")] == [1]
+        assert other.sessions[pristine_token]["cart"] == {5: 1}
+    assert b.login("alice","alicepwd") == token                # clones continue the same id sequence
+    b.update_item(5, price=100.0)
+    assert b.cart_total(pristine_token) == 100.0 and pristine.cart_total(pristine_token) == 299.0
+''')
+write_generated("test_regression.py", test_regression)
+
+# ------------------------ benchmarks (run by hand: python bench_<name>.py) ---------------------
+
+# ----- SEARCH: linear scan vs n-gram index, query latency against catalog size
+
+bench_search = textwrap.dedent(r'''
+import random, time
+from ecom_module import ECommerceSite
+
+WORDS = ["smart","phone","laptop","coffee","maker","wireless","earbuds","cover","blue","pro","alpha","lite","band","watch","cable"]
+QUERIES = ["phone", "coffee maker", "blue watch", "lite 42", "99", "xyz"]
+
+def build(n):
+    site = ECommerceSite()
+    rnd = random.Random(n)
+    for i in range(6, n+6):
+        site.add_item(i, " ".join(rnd.sample(WORDS, 3)) + f" {i}", rnd.randint(100, 50000), stock=rnd.randint(0, 20))
+    return site
+
+def first_search_s(site):
+    # the index is built on the first search (add_item keeps it current after that): a one-off cost
+    t0 = time.perf_counter()
+    site.search(QUERIES[0])
+    return time.perf_counter() - t0
+
+def linear_search(site, query):
+    q = query.lower()
+    return [{"id":i, **m} for i,m in site.items.items() if q in m["name"].lower()]
+
+def per_query_ms(fn, reps=20):
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        for q in QUERIES: fn(q)
+    return (time.perf_counter() - t0) * 1000 / (reps * len(QUERIES))
+
+if __name__ == "__main__":
+    print(f"{'catalog':>10} {'1st search s':>12} {'scan ms':>10} {'index ms':>10} {'top-20 ms':>10} {'speedup':>8}")
+    for n in (1_000, 10_000, 100_000, 200_000):
+        site = build(n)
+        build_s = first_search_s(site)
+        assert all([r["id"] for r in site.search(q)] == [r["id"] for r in linear_search(site, q)] for q in QUERIES)
+        scan = per_query_ms(lambda q: linear_search(site, q))
+        idx = per_query_ms(site.search)
+        top = per_query_ms(lambda q: site.search(q, in_stock=True, limit=20))
+        print(f"{n:>10} {build_s:>12.2f} {scan:>10.3f} {idx:>10.3f} {top:>10.3f} {scan/idx:>7.1f}x")
+''')
+write_generated("bench_search.py", bench_search)
+
+# ----- CHECKOUT: throughput of thread-safe checkout with a slow gateway, plus an oversell check
+
+bench_checkout = textwrap.dedent(r'''
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ecom_module import ECommerceSite
+
+class SlowGateway:
+    def __init__(self, latency): self.latency = latency
+    def process(self, payment_details, amount):
+        time.sleep(self.latency)
+        return True
+
+def run(workers, buyers=2000, stock=1500, latency=0.002):
+    site = ECommerceSite(thread_safe=True)
+    site.payment_gateway = SlowGateway(latency)
+    for i in range(10): site.add_item(100+i, f"SKU {i}", 100.0, stock=stock // 10)
+    tokens = [site.login("alice","alicepwd") for _ in range(buyers)]
+    for n, t in enumerate(tokens): site.add_to_cart(t, 100 + n % 10, qty=1)
+    sold = []
+    def buy(t):
+        try: sold.append(site.checkout(t, {"card_number":"4111"}))
+        except ValueError: pass
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool: list(pool.map(buy, tokens))
+    elapsed = time.perf_counter() - t0
+    left = sum(site.items[100+i]["stock"] for i in range(10))
+    assert left >= 0 and len(sold) == stock - left == len(set(sold)), "oversold!"
+    return len(sold) / elapsed, len(sold)
+
+if __name__ == "__main__":
+    print(f"{'workers':>8} {'orders/s':>10} {'sold':>6}")
+    for w in (1, 4, 16, 64):
+        rate, sold = run(w)
+        print(f"{w:>8} {rate:>10.0f} {sold:>6}")
 ''')
-with open(os.path.join(project_dir, "test_regression.py"), "w") as f:
-    f.write(test_regression)
+write_generated("bench_checkout.py", bench_checkout)
+
+# ----- PAYMENTS: sync process() vs overlapped checkout_async vs batched authorize, same stand-in latency
+
+bench_payments = textwrap.dedent(r'''
+import asyncio, time
+from async_gateway import LocalGateway, PaymentBatcher
+from ecom_module import ECommerceSite
+
+def make_site(n):
+    site = ECommerceSite(max_in_flight=64)
+    site.add_item(100, "Bench Widget", 10.0, stock=n)
+    tokens = [site.login("alice","alicepwd") for _ in range(n)]
+    for t in tokens: site.add_to_cart(t, 100, qty=1)
+    return site, tokens
 
+def run_sync(n, latency):
+    site, tokens = make_site(n)
+    site.payment_gateway = LocalGateway(latency=latency)
+    t0 = time.perf_counter()
+    for t in tokens: site.checkout(t, {"card_number":"4111"})
+    return time.perf_counter() - t0
 
+def run_async(n, latency, batched):
+    site, tokens = make_site(n)
+    gateway = LocalGateway(latency=latency, max_connections=16)
+    site.async_gateway = PaymentBatcher(gateway) if batched else gateway
+    async def main(): await asyncio.gather(*(site.checkout_async(t, {"card_number":"4111"}) for t in tokens))
+    t0 = time.perf_counter()
+    asyncio.run(main())
+    return time.perf_counter() - t0
+
+if __name__ == "__main__":
+    n, latency = 500, 0.01
+    for label, fn in [("sync process()", lambda: run_sync(n, latency)),
+                      ("checkout_async", lambda: run_async(n, latency, batched=False)),
+                      ("checkout_async + batch", lambda: run_async(n, latency, batched=True))]:
+        elapsed = fn()
+        print(f"{label:>24}: {n/elapsed:>9.0f} orders/s ({elapsed:.2f}s for {n})")
+''')
+write_generated("bench_payments.py", bench_payments)
+
+# ----- CATALOG: dict-of-dicts vs ColumnarCatalog at 1M SKUs (memory, lookups, inventory valuation)
+
+bench_catalog = textwrap.dedent(r'''
+import gc, random, time, tracemalloc
+from operator import mul
+from columnar_catalog import ColumnarCatalog
+
+N = 1_000_000
+
+def rows(n):
+    for i in range(1, n+1): yield i, {"name": f"Product {i} Variant {i % 97}", "price": float(i % 5000) + 0.99, "stock": i % 50}
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    cat = build()
+    built = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return cat, built, mem
+
+def dict_catalog(): return {i: m for i, m in rows(N)}
+
+def columnar(**opts):
+    cat = ColumnarCatalog(**opts)
+    for i, m in rows(N): cat[i] = m
+    return cat
+
+if __name__ == "__main__":
+    probe = random.Random(0).sample(range(1, N+1), 100_000)
+    for label, build in [("dict-of-dicts", dict_catalog), ("columnar", columnar),
+                         ("columnar+dedupe", lambda: columnar(dedupe_names=True))]:
+        cat, built, mem = measure(build)
+        t0 = time.perf_counter()
+        for i in probe: cat[i]["price"]
+        lookup = (time.perf_counter() - t0) / len(probe) * 1e9
+        t0 = time.perf_counter()
+        if isinstance(cat, ColumnarCatalog): value = sum(map(mul, cat.prices, cat.stocks))
+        else: value = sum(m["price"]*m["stock"] for m in cat.values())
+        valuation = (time.perf_counter() - t0) * 1000
+        print(f"{label:>16}: {mem/N:>6.0f} B/SKU  build {built:.2f}s  items[id]['price'] {lookup:.0f} ns  "
+              f"stock valuation {valuation:.0f} ms ({value:.0f})")
+        del cat
+''')
+write_generated("bench_catalog.py", bench_catalog)
+
+# ----- BATCH: scalar add_to_cart/cart_total/apply_coupon loops vs the bulk entry points
+
+bench_batch = textwrap.dedent(r'''
+import random, time
+from ecom_module import ECommerceSite
+
+SESSIONS, LINES = 100_000, 5
+
+def setup():
+    site = ECommerceSite()
+    for i in range(100, 1100): site.add_item(i, f"SKU {i}", 10.0 + i % 300, stock=10**9)
+    tokens = [site.login("alice","alicepwd") for _ in range(SESSIONS)]
+    rnd = random.Random(1)
+    rows = [(t, rnd.randrange(100, 1100), rnd.randint(1, 4)) for t in tokens for _ in range(LINES)]
+    return site, tokens, rows
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+def reprice(site):
+    for i in range(100, 1100, 7): site.update_item(i, price=site.items[i]["price"] * 1.05)
+
+if __name__ == "__main__":
+    a, tokens, rows = setup()
+    b, _, _ = setup()
+    _, add_s = timed(lambda: [a.add_to_cart(*r) for r in rows])
+    _, add_b = timed(lambda: b.add_to_cart_many(rows))
+    reprice(a); reprice(b)
+    ta, tot_s = timed(lambda: [a.cart_total(t) for t in tokens])
+    tb, tot_b = timed(lambda: b.cart_totals(tokens))
+    assert ta == tb
+    ca, cpn_s = timed(lambda: [a.apply_coupon(t, "PERC10") for t in tokens])
+    cb, cpn_b = timed(lambda: b.preview_coupons(tokens, "PERC10"))
+    assert ca == cb
+    for label, s, bt in [("add rows", add_s, add_b), ("totals after reprice", tot_s, tot_b), ("coupon preview", cpn_s, cpn_b)]:
+        print(f"{label:>22}: scalar {s*1000:>8.1f} ms  batch {bt*1000:>8.1f} ms  {s/bt:>5.1f}x")
+''')
+write_generated("bench_batch.py", bench_batch)
+
+# ----- SNAPSHOT: start-up time from a 1M-SKU snapshot vs rebuilding the catalog
+
+bench_snapshot = textwrap.dedent(r'''
+import os, random, tempfile, time
+from columnar_catalog import ColumnarCatalog
+from ecom_module import ECommerceSite
+
+N = 1_000_000
+
+def build():
+    cat = ColumnarCatalog()
+    for i in range(1, N+1): cat[i] = {"name": f"Product {i}", "price": float(i % 5000) + 0.99, "stock": i % 50}
+    return cat
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    site = ECommerceSite(catalog=lambda _defaults: build())
+    rebuild = time.perf_counter() - t0
+    path = os.path.join(tempfile.mkdtemp(), "catalog.snap")
+    t0 = time.perf_counter()
+    site.save_snapshot(path)
+    save = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    loaded = ECommerceSite.load_snapshot(path)
+    load = time.perf_counter() - t0
+    probe = random.Random(0).sample(range(1, N+1), 10_000)
+    t0 = time.perf_counter()
+    for i in probe: loaded.items[i]["price"]
+    lookups = (time.perf_counter() - t0) / len(probe) * 1e6
+    print(f"rebuild catalog: {rebuild*1000:>8.1f} ms")
+    print(f"save snapshot:   {save*1000:>8.1f} ms ({os.path.getsize(path)/N:.0f} B/SKU on disk)")
+    print(f"load snapshot:   {load*1000:>8.1f} ms")
+    print(f"first lookups:   {lookups:>8.2f} us each (mmapped, binary-searched)")
+''')
+write_generated("bench_snapshot.py", bench_snapshot)
+
+# ----- SESSIONS: memory after millions of logins, unbounded dict vs SessionStore
+
+bench_sessions = textwrap.dedent(r'''
+import time, tracemalloc
+from ecom_module import ECommerceSite
+
+LOGINS = 2_000_000
+
+def run(**opts):
+    site = ECommerceSite(**opts)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for _ in range(LOGINS): site.login("alice","alicepwd")
+    elapsed = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return site, elapsed, mem
+
+if __name__ == "__main__":
+    for label, opts in [("dict (unbounded)", {}), ("SessionStore 50k/30min", {"max_sessions": 50_000, "session_ttl": 1800})]:
+        site, elapsed, mem = run(**opts)
+        stats = getattr(site.sessions, "stats", {})
+        print(f"{label:>24}: {len(site.sessions):>9} live  {mem/2**20:>8.1f} MiB  {LOGINS/elapsed:>9.0f} logins/s  {stats}")
+''')
+write_generated("bench_sessions.py", bench_sessions)
+
+# ----- ORDERS: indexed find_orders vs a full scan of self.orders at 1M orders
+
+bench_orders = textwrap.dedent(r'''
+import random, time
+from ecom_module import ECommerceSite
+
+N, USERS = 1_000_000, 50_000
+
+def build():
+    site = ECommerceSite()
+    rnd = random.Random(7)
+    for oid in range(1, N+1):
+        order = {"id": oid, "items": {5: 1}, "total": 299.0, "status": "Confirmed",
+                 "user": f"user{rnd.randrange(USERS)}", "created_at": 1_700_000_000.0 + oid}
+        site.orders[oid] = order
+        site._index_order(order)
+    for oid in rnd.sample(range(1, N+1), N // 20): site.cancel_order(oid)
+    return site
+
+def scan(site, user=None, status=None, since=None, until=None, limit=None):
+    return [o for o in site.orders.values()
+            if (user is None or o["user"] == user) and (status is None or o["status"] == status)
+            and (since is None or o["created_at"] >= since) and (until is None or o["created_at"] <= until)][:limit]
+
+def ms(fn, reps=5):
+    t0 = time.perf_counter()
+    for _ in range(reps): fn()
+    return (time.perf_counter() - t0) * 1000 / reps
+
+if __name__ == "__main__":
+    site = build()
+    day_start = 1_700_000_000.0 + N - 86_400
+    queries = {"user history": dict(user="user123"),
+               "confirmed for user": dict(user="user123", status="Confirmed"),
+               "cancelled in last day": dict(status="Cancelled", since=day_start),
+               "orders in last hour": dict(since=1_700_000_000.0 + N - 3600),
+               "first 50 confirmed": dict(status="Confirmed", limit=50),
+               "first 50, no filter": dict(limit=50)}
+    for label, q in queries.items():
+        assert site.find_orders(**q) == scan(site, **q)
+        print(f"{label:>22}: scan {ms(lambda: scan(site, **q)):>8.2f} ms  index {ms(lambda: site.find_orders(**q)):>8.3f} ms")
+''')
+write_generated("bench_orders.py", bench_orders)
+
+# ----- FIXTURE: per-test ECommerceSite() vs clone() of a pristine, seeded site
+
+bench_fixture = textwrap.dedent(r'''
+import time
+from ecom_module import ECommerceSite
+
+SEED, TESTS = 100_000, 200
+
+def seeded():
+    site = ECommerceSite()
+    for i in range(6, SEED + 6): site.add_item(i, f"Seeded product {i}", 10.0 + i % 500, stock=i % 40)
+    site._search_index()
+    return site
+
+def a_test(site):
+    token = site.login("alice","alicepwd")
+    site.add_to_cart(token, 1, qty=1)
+    site.add_to_cart(token, 777, qty=1)
+    site.checkout(token, {"card_number":"4111"})
+    assert site.search("product 4242")
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    for _ in range(TESTS // 20): a_test(seeded())       # time 1/20th of the runs and extrapolate
+    fresh = (time.perf_counter() - t0) * 20
+    t0 = time.perf_counter()
+    pristine = seeded()
+    for _ in range(TESTS): a_test(pristine.clone())
+    cloned = time.perf_counter() - t0
+    print(f"{TESTS} tests on a {SEED}-item catalog: per-test construction ~{fresh:.1f}s, clone fixture {cloned:.2f}s ({fresh/cloned:.0f}x)")
+''')
+write_generated("bench_fixture.py", bench_fixture)
+
+
+
+# ----- pytest plugin that reports collection vs test time (loaded with -p, never collected)
+
+timing_plugin = textwrap.dedent(r'''
+import json, os, time
+
+_marks = {}
+
+def pytest_sessionstart(session): _marks["start"] = time.perf_counter()
+def pytest_collection_finish(session): _marks["collected"] = time.perf_counter()
+
+def pytest_sessionfinish(session, exitstatus):
+    out = os.environ.get("ECOM_TIMING_FILE")
+    if not out: return
+    end = time.perf_counter()
+    collected = _marks.get("collected", end)
+    with open(out, "w") as f:
+        json.dump({"collect": collected - _marks.get("start", collected), "tests": end - collected}, f)
+''')
+write_generated("_timing_plugin.py", timing_plugin)
+
+for stale in set(manifest) - set(new_manifest):
+    if os.path.exists(os.path.join(project_dir, stale)): os.remove(os.path.join(project_dir, stale))
+with open(manifest_path, "w") as f: json.dump(new_manifest, f)
+gen_time = time.perf_counter() - gen_start
 
 # Run pytest
 print("Running pytest in:", project_dir)
+timing_file = os.path.join(project_dir, ".ecom_timing.json")
+env = dict(os.environ, ECOM_TIMING_FILE=timing_file, PYTHONPATH=os.pathsep.join(filter(None, [project_dir, os.environ.get("PYTHONPATH")])))
+run_start = time.perf_counter()
 try:
-    result = subprocess.run([sys.executable, "-m", "pytest", "-q", project_dir], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, timeout=60)
+    result = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "_timing_plugin", project_dir], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, timeout=60, env=env)
     print(result.stdout)
     print("Exit code:", result.returncode)
 except Exception as e:
@@ -219,8 +1734,18 @@ except Exception as e:
     print("Traceback:")
     import traceback
     traceback.print_exc()
+run_time = time.perf_counter() - run_start
+
+try:
+    with open(timing_file) as f: timing = json.load(f)
+except (FileNotFoundError, ValueError): timing = {}
+print("\nTiming:")
+print(f" - generate : {gen_time*1000:8.1f} ms ({len(rewritten)} of {len(new_manifest)} files rewritten)")
+print(f" - collect  : {timing.get('collect', float('nan'))*1000:8.1f} ms")
+print(f" - tests    : {timing.get('tests', float('nan'))*1000:8.1f} ms")
+print(f" - pytest   : {run_time*1000:8.1f} ms wall (incl. interpreter start-up)")
 
-print("\nFiles created:")
+print("\nFiles:")
 for fn in sorted(os.listdir(project_dir)):
-    print(" -", fn)
+    print(" -", fn + (" (rewritten)" if fn in rewritten else ""))
 
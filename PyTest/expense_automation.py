@@ -78,6 +78,47 @@ def test_manager_can_approve_claim_and_status_updates(manager_session, app, empl
     status = app.get_claim_status(claim_id)
     assert status == "Approved"
 
+@pytest.mark.sanity
+def test_duplicate_receipts_are_stored_once_and_stream_in(app, employee_session):
+    import io
+    app_emp, emp_token = employee_session
+    c1 = app_emp.create_claim(session=emp_token, title="Hotel", amount=90.0, date="2025-09-08", category="Travel")
+    c2 = app_emp.create_claim(session=emp_token, title="Hotel again", amount=90.0, date="2025-09-09", category="Travel")
+    blob = b"%PDF" + bytes(range(256)) * 300
+    app_emp.upload_receipt(session=emp_token, claim_id=c1, filename="hotel.pdf", content=blob)
+    app_emp.upload_receipt(session=emp_token, claim_id=c2, filename="hotel-copy.pdf", content=io.BytesIO(blob))
+    app_emp.upload_receipt(session=emp_token, claim_id=c2, filename="chunked.pdf",
+                           content=(blob[i:i+1000] for i in range(0, len(blob), 1000)))
+    assert app.receipt_store.stats["blobs"] == 1 and app.receipt_store.stats["dedup_hits"] == 2
+    (r1,), (r2, r3) = app.get_claim_receipts(c1), app.get_claim_receipts(c2)
+    assert r1["digest"] == r2["digest"] == r3["digest"] and r3["size"] == len(blob)
+    assert isinstance(r2["content"], memoryview) and r2["content"] == blob
+
+@pytest.mark.sanity
+def test_batch_validation_matches_single_claim_checks():
+    from zento_module import ZentoApp
+    app = ZentoApp(rules=[{"kind": "limit", "category": "Meals", "max": 200.0},
+                          {"kind": "daily", "category": "Meals", "max": 300.0}])
+    token = app.login(role="employee", username="alice", password="alicepwd")
+    ids = [app.create_claim(session=token, title=f"Meal {i}", amount=amount, date=day, category="Meals")
+           for i, (amount, day) in enumerate([(500.0, "2025-09-01"), (150.0, "2025-09-02"), (180.0, "2025-09-02"), (90.0, "2025-09-03")])]
+    batch = app.validate_claims(start_date="2025-09-01", end_date="2025-09-30")
+    assert batch == {cid: app.validate_claim(cid) for cid in ids if app.validate_claim(cid)}
+    assert batch[ids[0]][0] == "Meals claim of 500.0 exceeds per-diem of 200.0"
+    assert batch[ids[1]] == ["alice Meals total of 330.0 on 2025-09-02 exceeds daily cap of 300.0"]
+    assert ids[3] not in batch
+
+@pytest.mark.sanity
+def test_rule_messages_keep_format_specs_and_declaration_order():
+    from claim_rules import RuleSet
+    rules = RuleSet([{"kind": "limit", "category": None, "max": 1000.0, "message": "{category} claim of {amount:.2f} over {max:,.0f}"},
+                     {"kind": "limit", "category": "Meals", "max": 200.0, "message": "{category!r} {amount:>8.1f} > {max}"},
+                     {"kind": "daily", "category": "Meals", "max": 300.0, "message": "{employee}: {total:.2f} of {max:.0f} on {date}"}])
+    claim = {"id": 1, "amount": 1234.5, "category": "Meals", "employee": "alice", "date": "2025-09-01"}
+    assert rules.check_many([claim]) == {1: ["Meals claim of 1234.50 over 1,000", "'Meals'   1234.5 > 200.0",
+                                             "alice: 1234.50 of 300 on 2025-09-01"]}
+
+
 
 # --------------------------- test_regression.py ------------------------------
 
@@ -137,8 +178,39 @@ def test_reports_and_csv_export_correct_totals(app, employee_session):
     assert rep["total_amount"] == pytest.approx(250.0)
     assert "100.0" in csv_data and "150.0" in csv_data
 
+@pytest.mark.regression
+def test_report_is_date_ranged_and_csv_streams(app, employee_session):
+    import io
+    app_emp, emp_token = employee_session
+    # Created out of date order; the report must only pick up August
+    for day, amount, category in [("2025-09-01", 40.0, "Travel"), ("2025-08-31", 20.0, "Meals"),
+                                  ("2025-07-31", 80.0, "Meals"), ("2025-08-01", 10.0, "Travel")]:
+        app_emp.create_claim(session=emp_token, title=f"Claim {day}", amount=amount, date=day, category=category)
+    rep = app.generate_expense_report(start_date="2025-08-01", end_date="2025-08-31")
+    assert rep["count"] == 2 and rep["total_amount"] == pytest.approx(30.0)
+    assert rep["by_category"] == {"Travel": 10.0, "Meals": 20.0}
+    assert rep["by_status"] == {"Created": 30.0}
+    # Streaming export writes the same rows, in date order, in bounded chunks
+    out = io.StringIO()
+    assert app.export_report_csv(report_id=rep["id"], out=out) == 2
+    assert out.getvalue() == app.export_report_csv(report_id=rep["id"])
+    assert [line.split(",")[2] for line in out.getvalue().splitlines()[1:]] == ["2025-08-01", "2025-08-31"]
+    assert len(list(app.iter_report_csv(rep["id"], chunk_rows=1))) == 2
 
-
-
-
-
+@pytest.mark.regression
+def test_dashboard_pages_and_polls_changes_by_cursor(app, employee_session, manager_session):
+    app_emp, emp_token = employee_session
+    mgr_app, mgr_token = manager_session
+    ids = [app_emp.create_claim(session=emp_token, title=f"Cab {i}", amount=30.0, date="2025-09-10", category="Travel") for i in range(5)]
+    for claim_id in ids: app_emp.submit_claim(session=emp_token, claim_id=claim_id)
+    first = mgr_app.pending_claims_page(session=mgr_token, limit=3)
+    second = mgr_app.pending_claims_page(session=mgr_token, cursor=first["cursor"], limit=3)
+    assert [c["id"] for c in first["claims"] + second["claims"]] == ids and not second["more"]
+    # Approving takes a claim off the pending queue; the change feed reports only what moved
+    seen = mgr_app.changes_since(session=mgr_token, cursor=0)["cursor"]
+    mgr_app.manager_approve(session=mgr_token, claim_id=ids[1], comment="OK")
+    assert [c["id"] for c in mgr_app.list_pending_claims(session=mgr_token)] == ids[:1] + ids[2:]
+    changes = mgr_app.changes_since(session=mgr_token, cursor=seen)
+    assert [(c["id"], c["status"]) for c in changes["claims"]] == [(ids[1], "Approved")]
+    assert mgr_app.changes_since(session=mgr_token, cursor=changes["cursor"])["claims"] == []
+    assert [c["id"] for c in mgr_app.claims_page(session=mgr_token, status="Approved")["claims"]] == [ids[1]]
@@ -0,0 +1,191 @@
+# --------------------- SIMULATED INCO SPORTS SITE (used by sportsEquipment.py) -----------------------
+
+import copy, io, itertools, os, socket, time
+from read_cache import ReadThroughCache
+from receipt_store import ReceiptStore
+
+PDF_STUB = b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n" + b"% Inco Sports product catalogue\n" * 8 + b"%%EOF\n"
+
+class IncoSite:
+    """Public pages read through a TTL cache (`cache`); `fetches` counts what actually reached the
+    backing store, so a catalog crawl costs one fetch per object. Admin writes invalidate what they touch."""
+
+    def __init__(self, cache_ttl=300.0, fetch_delay=0.0, clock=time.monotonic, crm=None, lead_queue=None, brochure_dir=None):
+        self.fetch_delay = fetch_delay          # simulated CMS round-trip per fetch
+        self.cache = ReadThroughCache(ttl=cache_ttl, clock=clock)
+        self.fetches = {}
+        self._product_ids = itertools.count(1)
+        self._products = {}
+        for name, category in [("Pro Ten-Pin Bowling Lane", "Ten-Pin Bowling"), ("Bowling Ball Return", "Ten-Pin Bowling"),
+                               ("Trampoline Park Module", "Trampoline Parks"), ("Laser Tag Arena Kit", "Laser Tag")]:
+            self.create_product(name=name, category=category)
+        self._nav = ["Home", "Products", "About", "Resources", "Contact"]
+        self._contact = {"phone": "+91 98450 00000", "email": "sales@incosports.com", "address": "Bengaluru, India"}
+        self._brochure_ids = itertools.count(1)
+        self.brochures = {}                     # id -> metadata; the files live in brochure_store
+        self.brochure_store = ReceiptStore(brochure_dir)
+        self._add_brochure("inco_catalogue.pdf", PDF_STUB)
+        self.admin_users = {"admin": "adminpwd"}
+        self._admin_ids = itertools.count(1)
+        self.admin_sessions = set()
+        self.leads = []
+        self._lead_ids = itertools.count(1)
+        self.crm = crm                          # object with send(lead) and optionally send_batch(leads)
+        self.lead_queue = lead_queue.start(self._deliver_leads) if lead_queue is not None else None
+
+    # ---------- backing store (every call here is a "fetch")
+    def _fetch(self, kind, load):
+        self.fetches[kind] = self.fetches.get(kind, 0) + 1
+        if self.fetch_delay: time.sleep(self.fetch_delay)
+        return copy.deepcopy(load())
+
+    def _admin(self, session):
+        if session not in self.admin_sessions: raise PermissionError("Admin login required")
+
+    # ---------- public pages
+    def ping_homepage(self): return True
+
+    def get_navigation_items(self): return self.cache.get(("nav",), lambda: self._fetch("nav", lambda: self._nav))
+
+    def get_global_contact_info(self):
+        return self.cache.get(("contact",), lambda: self._fetch("contact", lambda: self._contact))
+
+    def get_product_list(self):
+        return self.cache.get(("products",), lambda: self._fetch("products", lambda: [
+            {"id": p["id"], "name": p["name"], "category": p["category"]} for p in self._products.values()]))
+
+    def _product(self, product_id):
+        if product_id not in self._products: return None
+        return self.cache.get(("product", product_id), lambda: self._fetch("product", lambda: self._products[product_id]))
+
+    def open_product(self, product_id):
+        """Product page: the cached product plus the cached company contact, composed per call so
+        a contact edit never needs to evict every product."""
+        product = self._product(product_id)
+        if product is None: return None
+        return dict(product, contact=self.get_global_contact_info())
+
+    def get_product_images(self, product_id):
+        product = self._product(product_id)
+        return list(product["images"]) if product else []
+
+    def is_enquire_button_present(self, product): return bool(product and product.get("enquire", False))
+
+    def get_brochures(self):
+        return self.cache.get(("brochures",), lambda: self._fetch("brochures", lambda: [
+            {"id": b["id"], "file_name": b["file_name"], "size": b["size"]} for b in self.brochures.values()]))
+
+    def _brochure(self, brochure_id):
+        if brochure_id not in self.brochures: raise ValueError("Invalid brochure")
+        return self.brochures[brochure_id]
+
+    def download_brochure(self, brochure_id):
+        """(content, content_type) with the whole file in memory; use iter_brochure / send_brochure for big files."""
+        b = self._brochure(brochure_id)
+        return bytes(self.brochure_store.view(b["digest"])), b["content_type"]
+
+    def brochure_range(self, brochure_id, start=0, end=None):
+        """Bytes [start, end) as a memoryview over an mmap of the file -- no copy, for HTTP Range requests."""
+        b = self._brochure(brochure_id)
+        end = b["size"] if end is None else min(end, b["size"])
+        if not 0 <= start <= end: raise ValueError(f"Invalid range {start}-{end} for {b['size']} bytes")
+        return self.brochure_store.view(b["digest"])[start:end]
+
+    def iter_brochure(self, brochure_id, chunk_size=1 << 16, start=0, end=None):
+        view = self.brochure_range(brochure_id, start, end)
+        for i in range(0, len(view), chunk_size): yield view[i:i+chunk_size]
+
+    def send_brochure(self, brochure_id, out, start=0, end=None):
+        """Write bytes [start, end) to `out` and return the count. Sockets and real files get a kernel-side
+        copy (socket.sendfile / os.sendfile); anything else gets mmap-backed chunks."""
+        b = self._brochure(brochure_id)
+        view = self.brochure_range(brochure_id, start, end)
+        count = len(view)
+        view.release()
+        if isinstance(out, socket.socket):
+            with open(self.brochure_store.path(b["digest"]), "rb") as f: return out.sendfile(f, start, count)
+        try: out_fd = out.fileno()
+        except (AttributeError, io.UnsupportedOperation): out_fd = None
+        if out_fd is not None and hasattr(os, "sendfile"):
+            out.flush()
+            with open(self.brochure_store.path(b["digest"]), "rb") as f:
+                sent = 0
+                while sent < count:
+                    n = os.sendfile(out_fd, f.fileno(), start + sent, count - sent)
+                    if n == 0: break
+                    sent += n
+            return sent
+        for chunk in self.iter_brochure(brochure_id, start=start, end=start + count): out.write(chunk)
+        return count
+
+    # ---------- enquiries
+    def send_crm_lead(self, lead): return self.crm.send(lead) if self.crm is not None else True
+
+    def _try_send(self, lead):
+        try: return bool(self.send_crm_lead(lead))
+        except Exception: return False
+
+    def _deliver_leads(self, leads):
+        # lead_queue worker: one bulk call when the CRM has one, else one call per lead, where one
+        # lead's error only fails that lead, so lead_queue retries just the failed ones
+        if self.crm is not None and hasattr(self.crm, "send_batch"): return self.crm.send_batch(leads)
+        return [self._try_send(lead) for lead in leads]
+
+    def submit_enquiry(self, name, email, message, product_id=None):
+        """Saves the lead (admin_list_leads sees it at once), then delivers it to the CRM inline,
+        or hands it to lead_queue and returns "queued" without waiting on the CRM."""
+        if "@" not in email: return {"status": "error", "message": "Invalid email"}
+        lead = {"id": next(self._lead_ids), "name": name, "email": email, "message": message, "product_id": product_id}
+        self.leads.append(lead)
+        if self.lead_queue is not None:
+            if self.lead_queue.submit(lead): return {"status": "queued", "lead_id": lead["id"]}
+            return {"status": "busy", "lead_id": lead["id"], "message": "Enquiry saved; CRM queue is full, please retry"}
+        if self._try_send(lead):
+            lead["crm_status"] = "delivered"
+            return {"status": "success", "lead_id": lead["id"]}
+        lead["crm_status"] = "failed"
+        return {"status": "failed", "lead_id": lead["id"], "message": "Enquiry saved; CRM delivery failed"}
+
+    def admin_list_leads(self): return list(self.leads)
+
+    # ---------- admin
+    def admin_login(self, username, password):
+        if self.admin_users.get(username) != password: raise ValueError("Invalid credentials")
+        token = f"admin_{next(self._admin_ids)}"
+        self.admin_sessions.add(token)
+        return token
+
+    def create_product(self, name, category, description=None, images=None):
+        product_id = next(self._product_ids)
+        self._products[product_id] = {"id": product_id, "name": name, "category": category,
+                                      "description": description or f"{name} by Inco Sports ({category}).",
+                                      "images": list(images or [f"/media/products/{product_id}/main.jpg"]), "enquire": True}
+        self.cache.invalidate(("products",))
+        return product_id
+
+    def update_product(self, session, product_id, **fields):
+        self._admin(session)
+        if product_id not in self._products: raise ValueError("Invalid product")
+        self._products[product_id].update(fields)
+        self.cache.invalidate(("product", product_id))
+        if "name" in fields or "category" in fields: self.cache.invalidate(("products",))
+        return True
+
+    def update_contact_info(self, session, **fields):
+        self._admin(session)
+        self._contact.update(fields)
+        self.cache.invalidate(("contact",))
+        return True
+
+    def _add_brochure(self, file_name, content):
+        digest, size = self.brochure_store.put(content)
+        brochure_id = next(self._brochure_ids)
+        self.brochures[brochure_id] = {"id": brochure_id, "file_name": file_name, "digest": digest, "size": size,
+                                       "content_type": "application/pdf" if file_name.lower().endswith(".pdf") else "application/octet-stream"}
+        self.cache.invalidate(("brochures",))
+        return brochure_id
+
+    def upload_brochure(self, session, file_name, content):
+        """content may be bytes, a file-like, or an iterable of chunks; it is streamed to disk, never held whole."""
+        self._admin(session)
+        return self._add_brochure(file_name, content)
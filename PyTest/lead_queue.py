@@ -0,0 +1,123 @@
+# --------------------- QUEUED CRM LEAD DELIVERY (used by inco_module.py) -----------------------
+
+import itertools, queue, threading, time
+
+_STOP = object()
+
+class LocalCRM:
+    """Stand-in CRM: every call costs one simulated round-trip of `latency` seconds;
+    send_batch() delivers many leads for one round-trip, like a bulk-insert endpoint.
+    The first `fail_first` round-trips raise ConnectionError, to exercise retries."""
+    def __init__(self, latency=0.02, batch_latency=None, fail_first=0):
+        self.latency = latency
+        self.batch_latency = latency if batch_latency is None else batch_latency
+        self.fail_first = fail_first
+        self.round_trips = 0
+        self.received = []
+        self._lock = threading.Lock()
+
+    def _round_trip(self, delay):
+        time.sleep(delay)
+        with self._lock:
+            self.round_trips += 1
+            if self.round_trips <= self.fail_first: raise ConnectionError("CRM unavailable")
+
+    def send(self, lead):
+        self._round_trip(self.latency)
+        self.received.append(lead)
+        return True
+
+    def send_batch(self, leads):
+        self._round_trip(self.batch_latency)
+        self.received.extend(leads)
+        return [True] * len(leads)
+
+class LeadQueue:
+    """Bounded in-process queue in front of the CRM.
+
+    submit() waits at most `put_timeout` for room and returns False when the queue stays full
+    (backpressure: the caller tells the visitor to try again). `workers` threads each drain up to
+    `max_batch` leads, waiting at most `window` seconds to fill a batch, and hand them to the sender
+    in one call. Leads the sender refuses or raises on are retried `retries` times with exponential
+    backoff, then marked "failed"; an answer that isn't one result per lead fails the whole batch.
+    Each lead's "crm_status" tracks where it is.
+    """
+    def __init__(self, maxsize=1000, max_batch=50, window=0.01, workers=2, retries=3, backoff=0.05, put_timeout=0.5):
+        self.max_batch, self.window, self.retries, self.backoff, self.put_timeout = max_batch, window, retries, backoff, put_timeout
+        self.workers = workers
+        self._queue = queue.Queue(maxsize)
+        self._threads = []
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "rejected": 0, "delivered": 0, "failed": 0, "batches": 0, "retries": 0}
+
+    def start(self, send_batch):
+        """send_batch(leads) -> [ok, ...]; called from the worker threads."""
+        self._send_batch = send_batch
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"lead-queue-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def _bump(self, key, n=1):
+        with self._lock: self.stats[key] += n
+
+    def submit(self, lead):
+        lead["crm_status"] = "queued"
+        try: self._queue.put(lead, timeout=self.put_timeout)
+        except queue.Full:
+            lead["crm_status"] = "rejected"
+            self._bump("rejected")
+            return False
+        self._bump("queued")
+        return True
+
+    def __len__(self): return self._queue.qsize()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP: break
+            batch, deadline = [item], time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                try: item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty: break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            try: self._deliver(batch)
+            finally:
+                for _ in batch: self._queue.task_done()
+        self._queue.task_done()
+
+    def _deliver(self, batch):
+        self._bump("batches")
+        for attempt in itertools.count():
+            try:
+                results = list(self._send_batch(batch))
+                if len(results) != len(batch): raise ValueError(f"{len(results)} results for {len(batch)} leads")
+            except Exception: results = [False] * len(batch)     # unusable answer: the whole batch failed
+            failed = []
+            for lead, ok in zip(batch, results):
+                if ok: lead["crm_status"] = "delivered"
+                else: failed.append(lead)
+            self._bump("delivered", len(batch) - len(failed))
+            if not failed: return
+            if attempt >= self.retries:
+                for lead in failed: lead["crm_status"] = "failed"
+                self._bump("failed", len(failed))
+                return
+            self._bump("retries")
+            batch = failed
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def join(self):
+        """Block until every queued lead has been delivered or given up on."""
+        self._queue.join()
+
+    def close(self):
+        for _ in self._threads: self._queue.put(_STOP)
+        for t in self._threads: t.join()
+        self._threads = []
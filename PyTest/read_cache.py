@@ -0,0 +1,70 @@
+# --------------------- READ-THROUGH TTL CACHE (used by inco_module.py) -----------------------
+
+import time
+
+class FrozenDict(dict):
+    """A dict whose mutators raise TypeError. Still a dict to json, and copy/deepcopy/pickle give a plain dict."""
+    def _read_only(self, *args, **kwargs): raise TypeError("cached values are read-only")
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+    def __reduce__(self): return dict, (dict(self),)
+
+def freeze(value):
+    """Read-only, JSON-safe form of a loaded value: dicts become FrozenDict, lists and tuples tuples, sets frozensets."""
+    if isinstance(value, dict): return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)): return tuple(map(freeze, value))
+    if isinstance(value, set): return frozenset(value)
+    return value
+
+def _fresh(value):
+    # the caller's own top-level list / dict over the shared, read-only contents: O(top level), not a deep copy
+    if isinstance(value, FrozenDict): return dict(value)
+    if isinstance(value, tuple): return list(value)
+    return value
+
+class ReadThroughCache:
+    """get(key, load) returns the cached value while it is younger than ttl, else calls load() once and keeps it.
+    The cached value stays private and frozen (see freeze); each call gets a fresh top-level list or dict over
+    the shared read-only contents, so no caller can edit what the next one sees.
+    Keys are tuples whose first item is the kind ("product", "nav", ...); hits and misses are counted per kind.
+    Writers call invalidate(key) / invalidate_kind(kind) so edits show up before the ttl runs out."""
+
+    def __init__(self, ttl=300.0, clock=time.monotonic):
+        self.ttl, self.clock = ttl, clock
+        self._entries = {}        # key -> (expires_at, value)
+        self._counts = {}         # kind -> [hits, misses, invalidations]
+
+    def _count(self, kind, i):
+        counts = self._counts.get(kind)
+        if counts is None: counts = self._counts[kind] = [0, 0, 0]
+        counts[i] += 1
+
+    def get(self, key, load):
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._count(key[0], 0)
+            return _fresh(entry[1])
+        self._count(key[0], 1)
+        value = freeze(load())
+        self._entries[key] = (now + self.ttl, value)
+        return _fresh(value)
+
+    def invalidate(self, key):
+        if self._entries.pop(key, None) is not None: self._count(key[0], 2)
+
+    def invalidate_kind(self, kind):
+        for key in [k for k in self._entries if k[0] == kind]: self.invalidate(key)
+
+    def clear(self): self._entries.clear()
+
+    def __len__(self): return len(self._entries)
+
+    @property
+    def stats(self):
+        out = {}
+        for kind, (hits, misses, invalidations) in self._counts.items():
+            out[kind] = {"hits": hits, "misses": misses, "invalidations": invalidations,
+                         "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+        hits, misses = sum(s["hits"] for s in out.values()), sum(s["misses"] for s in out.values())
+        out["total"] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+        return out
@@ -0,0 +1,84 @@
+# --------------------- CONTENT-ADDRESSED RECEIPT STORE (used by zento_module.py) -----------------------
+
+import hashlib, mmap, os, tempfile
+
+CHUNK = 1 << 16
+
+class ReceiptStore:
+    """Receipt blobs on disk under their sha256, each distinct content written once.
+    put() accepts bytes, a file-like with .read(), or an iterable of byte chunks;
+    view() hands back a read-only memoryview over an mmap of the blob, not a copy."""
+
+    def __init__(self, root=None):
+        if root is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="receipts-")
+            root = self._tmp.name
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._sizes = {}
+        self.stats = {"blobs": 0, "bytes_stored": 0, "bytes_received": 0, "dedup_hits": 0}
+
+    def path(self, digest): return os.path.join(self.root, digest[:2], digest[2:])
+
+    def __contains__(self, digest): return digest in self._sizes or os.path.exists(self.path(digest))
+
+    def size(self, digest):
+        if digest not in self._sizes: self._sizes[digest] = os.path.getsize(self.path(digest))
+        return self._sizes[digest]
+
+    def put(self, content):
+        """Store content, returning (digest, size). Known content is never rewritten."""
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            digest = hashlib.sha256(content).hexdigest()
+            self.stats["bytes_received"] += len(content)
+            if digest in self: return self._seen(digest)
+            return self._commit(digest, len(content), lambda f: f.write(content))
+        chunks = iter(lambda: content.read(CHUNK), b"") if hasattr(content, "read") else content
+        h, size = hashlib.sha256(), 0
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    h.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+            digest = h.hexdigest()
+            self.stats["bytes_received"] += size
+            if digest in self: return self._seen(digest)
+            os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+            os.replace(tmp, self.path(digest))
+            return self._stored(digest, size)
+        finally:
+            if os.path.exists(tmp): os.unlink(tmp)
+
+    def _seen(self, digest):
+        self.stats["dedup_hits"] += 1
+        return digest, self.size(digest)
+
+    def _commit(self, digest, size, write):
+        # write beside the target and rename, so a crash never leaves a half blob under a valid digest
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f: write(f)
+            os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+            os.replace(tmp, self.path(digest))
+        finally:
+            if os.path.exists(tmp): os.unlink(tmp)
+        return self._stored(digest, size)
+
+    def _stored(self, digest, size):
+        self._sizes[digest] = size
+        self.stats["blobs"] += 1
+        self.stats["bytes_stored"] += size
+        return digest, size
+
+    def view(self, digest):
+        """Read-only memoryview of the blob; pages are faulted in from the OS cache on access."""
+        if self.size(digest) == 0: return memoryview(b"")
+        with open(self.path(digest), "rb") as f:
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def iter_chunks(self, digest, chunk=CHUNK):
+        """Stream a blob back out in slices of one mapping."""
+        view = self.view(digest)
+        for i in range(0, len(view), chunk): yield view[i:i+chunk]
@@ -1,7 +1,7 @@
 # ---------------------------------- conftest.py ---------------------------------
 
 import pytest
-# from inco_module import IncoSite  # replace with actual client/selenium page objects
+from inco_module import IncoSite  # simulated module (or an API wrapper)
 
 @pytest.fixture
 def site(): return IncoSite()    # returns a fresh site/client instance per test
@@ -77,6 +77,49 @@ def test_product_gallery_images_render(sample_product):
     assert isinstance(imgs, list)
     assert len(imgs) >= 0  # test passes even if none; change to >=1 if images required
 
+@pytest.mark.sanity
+def test_cached_pages_expire_after_ttl():
+    now = [0.0]
+    site = IncoSite(cache_ttl=60.0, clock=lambda: now[0])
+    site.get_navigation_items(); site.get_navigation_items()
+    now[0] = 61.0
+    site.get_navigation_items()
+    assert site.fetches["nav"] == 2 and site.cache.stats["nav"]["hits"] == 1
+
+@pytest.mark.sanity
+def test_cached_pages_are_private_and_serializable(site):
+    import copy, json, pickle
+    nav, product, products = site.get_navigation_items(), site.open_product(1), site.get_product_list()
+    assert type(nav) is list and type(product) is dict and type(products) is list
+    nav.append("Careers")                        # top-level lists and dicts are the caller's own
+    product["name"] = "Renamed"
+    product["contact"]["email"] = "spam@example.com"
+    with pytest.raises(TypeError): products[0]["name"] = "Renamed"      # nested values are shared, read-only
+    assert "Careers" not in site.get_navigation_items() and site.open_product(1)["name"] == "Pro Ten-Pin Bowling Lane"
+    assert site.get_global_contact_info()["email"] == "sales@incosports.com" and site.fetches["nav"] == 1
+    page = site.open_product(1)
+    assert json.loads(json.dumps(page))["contact"]["email"] == "sales@incosports.com"
+    assert json.loads(json.dumps(site.get_product_list()))[0]["name"] == "Pro Ten-Pin Bowling Lane"
+    assert copy.deepcopy(page) == page == pickle.loads(pickle.dumps(page))
+    thawed = copy.deepcopy(products)
+    thawed[0]["name"] = "Edited copy"            # deepcopy/pickle hand back plain, editable dicts
+    assert site.get_product_list()[0]["name"] == "Pro Ten-Pin Bowling Lane"
+
+@pytest.mark.sanity
+def test_brochure_streams_in_and_out_by_range(site, tmp_path):
+    import io
+    admin = site.admin_login(username="admin", password="adminpwd")
+    data = b"%PDF-1.7\n" + bytes(range(256)) * 4096
+    bid = site.upload_brochure(session=admin, file_name="big.pdf", content=(data[i:i+5000] for i in range(0, len(data), 5000)))
+    assert site.download_brochure(brochure_id=bid) == (data, "application/pdf")
+    assert site.brochure_range(bid, 100, 200) == data[100:200]
+    assert b"".join(site.iter_brochure(bid, chunk_size=7000, start=10)) == data[10:]
+    with open(tmp_path / "out.pdf", "wb") as out: assert site.send_brochure(bid, out, start=5, end=len(data) + 99) == len(data) - 5
+    assert (tmp_path / "out.pdf").read_bytes() == data[5:]
+    buf = io.BytesIO()
+    site.send_brochure(bid, buf, end=1000)
+    assert buf.getvalue() == data[:1000]
+
 # ---------------------------------- test_regression_inco.py ---------------------------------- 
 
 import pytest
@@ -112,7 +155,84 @@ def test_admin_upload_brochure_reflects_on_public_listing(site):
     public = site.get_brochures()
     assert any(b["id"] == new_brochure_id for b in public)
 
+@pytest.mark.regression
+def test_catalog_crawl_fetches_each_object_once_and_edits_invalidate(site):
+    for _ in range(3):
+        for p in site.get_product_list():
+            site.open_product(p["id"])
+            site.get_global_contact_info()
+    assert site.fetches["product"] == len(site.get_product_list()) and site.fetches["contact"] == 1
+    assert site.cache.stats["product"]["hit_rate"] > 0.6
+    # admin edits are visible straight away, without waiting for the ttl
+    admin = site.admin_login(username="admin", password="adminpwd")
+    pid = site.get_product_list()[0]["id"]
+    site.update_product(session=admin, product_id=pid, description="Refurbished lanes")
+    site.update_contact_info(session=admin, email="hello@incosports.com")
+    pd = site.open_product(pid)
+    assert pd["description"] == "Refurbished lanes" and pd["contact"]["email"] == "hello@incosports.com"
+    assert site.fetches["product"] == len(site.get_product_list()) + 1
 
+@pytest.mark.regression
+def test_queued_enquiries_are_batched_retried_and_visible_at_once():
+    from lead_queue import LeadQueue, LocalCRM
+    crm = LocalCRM(latency=0.01, fail_first=1)
+    site = IncoSite(crm=crm, lead_queue=LeadQueue(max_batch=20, window=0.02, workers=1, backoff=0.001))
+    results = [site.submit_enquiry(name=f"Buyer {i}", email=f"buyer{i}@x.com", message="Quote please") for i in range(40)]
+    assert {r["status"] for r in results} == {"queued"}
+    assert len(site.admin_list_leads()) == 40       # visible before the CRM has seen anything
+    site.lead_queue.join()
+    site.lead_queue.close()
+    assert sorted(l["email"] for l in crm.received) == sorted(f"buyer{i}@x.com" for i in range(40))
+    assert crm.round_trips < 40 and site.lead_queue.stats["retries"] >= 1
+    assert {l["crm_status"] for l in site.admin_list_leads()} == {"delivered"}
 
+@pytest.mark.regression
+def test_per_lead_crm_errors_only_retry_the_failed_leads():
+    from lead_queue import LeadQueue
+    class FlakyCRM:                                  # no send_batch: one call per lead
+        def __init__(self): self.calls = {}
+        def send(self, lead):
+            self.calls[lead["email"]] = self.calls.get(lead["email"], 0) + 1
+            if lead["email"] == "bad@x.com": raise ConnectionError("rejected")
+            return True
+    crm = FlakyCRM()
+    site = IncoSite(crm=crm, lead_queue=LeadQueue(max_batch=10, window=0.02, workers=1, retries=2, backoff=0.001))
+    for email in ("a@x.com", "bad@x.com", "b@x.com"): site.submit_enquiry(name="B", email=email, message="Hi")
+    site.lead_queue.join()
+    site.lead_queue.close()
+    assert crm.calls == {"a@x.com": 1, "bad@x.com": 3, "b@x.com": 1}
+    assert [l["crm_status"] for l in site.admin_list_leads()] == ["delivered", "failed", "delivered"]
+    inline = IncoSite(crm=crm)
+    assert inline.submit_enquiry(name="B", email="bad@x.com", message="Hi")["status"] == "failed"
+    assert inline.admin_list_leads()[0]["crm_status"] == "failed"
 
+@pytest.mark.regression
+@pytest.mark.parametrize("answer", [lambda n: [True] * (n - 1), lambda n: None, lambda n: True], ids=["short", "none", "scalar"])
+def test_malformed_bulk_answers_fail_the_batch(answer):
+    from lead_queue import LeadQueue
+    class BadBulkCRM:
+        def send(self, lead): return True
+        def send_batch(self, leads): return answer(len(leads))
+    site = IncoSite(crm=BadBulkCRM(), lead_queue=LeadQueue(max_batch=10, window=0.02, workers=1, retries=1, backoff=0.001))
+    for i in range(3): site.submit_enquiry(name="B", email=f"b{i}@x.com", message="Hi")
+    site.lead_queue.join()
+    site.submit_enquiry(name="B", email="late@x.com", message="Hi")     # the worker survived
+    site.lead_queue.join()
+    site.lead_queue.close()
+    assert {l["crm_status"] for l in site.admin_list_leads()} == {"failed"}
+    assert site.lead_queue.stats["delivered"] == 0 and site.lead_queue.stats["failed"] == 4
 
+@pytest.mark.regression
+def test_full_lead_queue_pushes_back():
+    import threading
+    from lead_queue import LeadQueue
+    gate = threading.Event()
+    class SlowCRM:
+        def send(self, lead): return gate.wait(5)
+    site = IncoSite(crm=SlowCRM(), lead_queue=LeadQueue(maxsize=2, max_batch=1, window=0, workers=1, put_timeout=0.01))
+    statuses = [site.submit_enquiry(name="B", email=f"b{i}@x.com", message="Hi")["status"] for i in range(6)]
+    gate.set()
+    site.lead_queue.join()
+    site.lead_queue.close()
+    assert "busy" in statuses and len(site.admin_list_leads()) == 6
+    assert site.lead_queue.stats["rejected"] == statuses.count("busy")
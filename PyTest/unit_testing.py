@@ -103,3 +103,367 @@ pw_list = ["Password123!", "aB1@cDeFghIjK", "short", "toolongpasswordtoolong"]
 def test_password(password):
   assert validate_password(password) == True
   # print(f'Found password {password} as :', validate_password(password))
+
+
+# ---------- FAST PASSWORD VALIDATION: ONE PASS PER PASSWORD, RULES AS DATA, BULK API ----------
+
+%%writefile password_policy.py           # saves this code snippet as a file in Colab
+
+import string
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+SPECIAL = '!@#$%^&*(),.?":{}|<>'
+
+DEFAULT_RULES = [                                       # same checks, same order as validate_password
+    {"rule": "length", "min": 8, "max": 16},
+    {"rule": "forbid", "chars": " -"},
+    {"rule": "require", "name": "digit", "chars": string.digits, "unicode": str.isdecimal},   # re's \d also matches non-ASCII digits
+    {"rule": "require", "name": "special", "chars": SPECIAL},
+    {"rule": "require", "name": "upper", "chars": string.ascii_uppercase},
+    {"rule": "require", "name": "lower", "chars": string.ascii_lowercase},
+]
+
+MASK_BITS = array("I").itemsize * 8                     # failure masks travel between processes as array("I")
+
+class _Reasons(dict):
+    # mask -> tuple of reason names, decoded on first use, so only the combinations actually seen are kept
+    def __init__(self, reasons): self.reasons = reasons
+    def __missing__(self, mask):
+        decoded = self[mask] = tuple(r for i, r in enumerate(self.reasons) if mask >> i & 1)
+        return decoded
+
+class PasswordPolicy:
+    """Rules compiled once into a str.translate table that maps every ASCII character to the codes of
+    the rules it touches. One translate call classifies the whole password; the checks are then
+    set tests on the few codes that came out. Non-ASCII passwords take a per-rule fallback so that
+    results match re's Unicode \\d exactly."""
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = list(rules)
+        self.min_len, self.max_len, self.forbidden, self.required = 0, float("inf"), frozenset(), []
+        for r in self.rules:
+            if r["rule"] == "length": self.min_len, self.max_len = r.get("min", 0), r.get("max", float("inf"))
+            elif r["rule"] == "forbid": self.forbidden |= frozenset(r["chars"])
+            elif r["rule"] == "require": self.required.append((r["name"], frozenset(r["chars"]), r.get("unicode")))
+            else: raise ValueError(f"Unknown rule: {r['rule']}")
+        codes = {"forbid": "\0"} | {name: chr(i + 1) for i, (name, _, _) in enumerate(self.required)}
+        self._table = {}
+        for c in map(chr, range(128)):
+            hit = (codes["forbid"] if c in self.forbidden else "") + "".join(codes[n] for n, m, _ in self.required if c in m)
+            self._table[ord(c)] = hit or None
+        self._need = frozenset(codes[name] for name, _, _ in self.required)
+        # failures travel as bitmasks (bit i = reasons[i]) and decode to shared tuples
+        self.reasons = ["too_short", "too_long", "forbidden_char"] + [f"missing_{name}" for name, _, _ in self.required]
+        if len(self.reasons) > MASK_BITS: raise ValueError(f"At most {MASK_BITS - 3} require rules, got {len(self.required)}")
+        self._missing_bits = [(8 << i, codes[name]) for i, (name, _, _) in enumerate(self.required)]
+        self._decoded = _Reasons(self.reasons)
+
+    def is_valid(self, password):
+        if not self.min_len <= len(password) <= self.max_len: return False
+        if not password.isascii(): return not self._slow_mask(password, 0)
+        found = set(password.translate(self._table))
+        return found == self._need or ("\0" not in found and found >= self._need)
+
+    def failures(self, password):
+        """Every rule the password breaks, e.g. ("too_short", "missing_digit"); () means valid."""
+        return self._decoded[self._mask(password)]
+
+    def _mask(self, password):
+        mask = 1 if len(password) < self.min_len else 2 if len(password) > self.max_len else 0
+        if not password.isascii(): return self._slow_mask(password, mask)
+        found = set(password.translate(self._table))
+        if found == self._need: return mask
+        if "\0" in found: mask |= 4
+        for bit, code in self._missing_bits:
+            if code not in found: mask |= bit
+        return mask
+
+    def _slow_mask(self, password, mask):
+        chars = set(password)
+        if not self.forbidden.isdisjoint(chars): mask |= 4
+        for i, (_, members, unicode) in enumerate(self.required):
+            if members.isdisjoint(chars) and not (unicode and any(unicode(c) for c in chars)): mask |= 8 << i
+        return mask
+
+    def _masks(self, passwords): return array("I", map(self._mask, passwords))
+
+    def validate_many(self, passwords, processes=None, chunk_size=50_000):
+        """Yields failures(p) (a tuple of reasons) for each password, in order. Reads `passwords` lazily in chunks; with
+        `processes`, chunks fan out to a process pool with at most 2 per worker in flight."""
+        if not processes:
+            yield from map(self.failures, passwords)
+            return
+        it = iter(passwords)
+        chunks = iter(lambda: list(islice(it, chunk_size)), [])
+        with ProcessPoolExecutor(processes) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(self._masks, chunk))
+                if len(pending) >= 2 * processes: yield from map(self._decoded.__getitem__, pending.popleft().result())
+            while pending: yield from map(self._decoded.__getitem__, pending.popleft().result())
+
+def validate_password(password, _policy=PasswordPolicy()): return _policy.is_valid(password)
+
+
+%%writefile test_password_policy.py           # saves this code snippet as a file in Colab
+
+import pytest, random, re
+from password_policy import PasswordPolicy, validate_password
+
+def reference_validate_password(password):                   # the original, kept to check equivalence
+    if len(password) < 8 or len(password) > 16: return False
+    if " " in password or "-" in password: return False
+    if not re.search(r'\d', password): return False
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password): return False
+    if not re.search(r'[A-Z]', password): return False
+    if not re.search(r'[a-z]', password): return False
+    return True
+
+def test_matches_original_on_random_passwords():
+    rnd = random.Random(0)
+    alphabet = "aZ9!- x€٣Ää" + '!@#$%^&*(),.?":{}|<>' + "abcXYZ0123"
+    passwords = ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 20))) for _ in range(20_000)]
+    passwords += ["Password123!", "aB1@cDeFghIjK", "Password٣!x", "short", "toolongpasswordtoolong"]
+    assert [validate_password(p) for p in passwords] == [reference_validate_password(p) for p in passwords]
+
+@pytest.mark.parametrize("password, reasons", [
+    ("Password123!", ()),
+    ("short", ("too_short", "missing_digit", "missing_special", "missing_upper")),
+    ("Password 123!", ("forbidden_char",)),
+    ("ABCDEFG@", ("missing_digit", "missing_lower")),
+    ("Pass٣word!", ()),
+])
+def test_failure_reasons(password, reasons):
+    assert PasswordPolicy().failures(password) == reasons
+
+def test_bulk_validation_in_order_with_process_pool():
+    passwords = ["Password123!", "short", "PASSWORD123!"] * 1000
+    expected = [PasswordPolicy().failures(p) for p in passwords]
+    assert list(PasswordPolicy().validate_many(passwords, chunk_size=128)) == expected
+    assert list(PasswordPolicy().validate_many(iter(passwords), processes=2, chunk_size=500)) == expected
+
+def test_rules_are_data():
+    pins = PasswordPolicy([{"rule": "length", "min": 4, "max": 6}, {"rule": "require", "name": "digit", "chars": "0123456789"}])
+    assert pins.failures("12a4") == () and pins.failures("abcdefg") == ("too_long", "missing_digit")
+
+def test_many_rules_decode_lazily_up_to_the_mask_width():
+    from password_policy import MASK_BITS
+    letters = [{"rule": "require", "name": c, "chars": c} for c in "abcdefghijklmnopqrstuvwxyz0123456789"]
+    wide = PasswordPolicy(letters[:MASK_BITS - 3])
+    last = letters[MASK_BITS - 4]["name"]
+    assert list(wide.validate_many(["abc"], processes=1)) == [tuple(f"missing_{r['name']}" for r in letters[3:MASK_BITS - 3])]
+    assert f"missing_{last}" in wide.failures("") and len(wide._decoded) == 2
+    with pytest.raises(ValueError): PasswordPolicy(letters[:MASK_BITS - 2])
+
+
+%%writefile bench_password_policy.py           # saves this code snippet as a file in Colab
+
+import random, re, string, sys, time
+from password_policy import PasswordPolicy
+
+def regex_validate_password(password):                       # the original validate_password
+    if len(password) < 8 or len(password) > 16: return False
+    if " " in password or "-" in password: return False
+    if not re.search(r'\d', password): return False
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password): return False
+    if not re.search(r'[A-Z]', password): return False
+    if not re.search(r'[a-z]', password): return False
+    return True
+
+if __name__ == "__main__":                                    # python bench_password_policy.py [N]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(1)
+    alphabet = string.ascii_letters + string.digits + "!@#$%&*?"
+    passwords = ["".join(rnd.choices(alphabet, k=rnd.randint(6, 18))) for _ in range(n)]
+    policy = PasswordPolicy()
+    for label, run in [("regex, one at a time", lambda: [regex_validate_password(p) for p in passwords]),
+                       ("PasswordPolicy.is_valid", lambda: [policy.is_valid(p) for p in passwords]),
+                       ("validate_many (reasons)", lambda: list(policy.validate_many(passwords))),
+                       ("validate_many, 4 procs", lambda: list(policy.validate_many(passwords, processes=4)))]:
+        t0 = time.perf_counter()
+        run()
+        print(f"{label:>26}: {n/(time.perf_counter()-t0):>10.0f} passwords/s")
+
+
+# ---------- STREAMING BULK REGISTRATION: CSV IN, ACCEPTED / REJECTED CSVs OUT ----------
+
+%%writefile registration_import.py           # saves this code snippet as a file in Colab
+
+import csv, math, time
+from contextlib import nullcontext
+from itertools import islice
+from test_registration import register_user
+
+FIELDS = ["username", "email", "password"]
+
+# Both indexes: probe(key) once, then has(probe) / put(probe), so a key is hashed once per row.
+
+class ExactIndex:
+    """Seen-set of 64-bit key hashes: no false positives in practice, memory grows with unique keys."""
+    def __init__(self): self._seen = set()
+    def probe(self, key): return hash(key)
+    def has(self, probe): return probe in self._seen
+    def put(self, probe): self._seen.add(probe)
+    def __contains__(self, key): return self.has(self.probe(key))
+    def add(self, key): self.put(self.probe(key))
+
+class BloomFilter:
+    """Fixed-size bit array sized for `capacity` keys at `error_rate`: memory never grows, but a new
+    key is reported as seen with probability ~error_rate (those rows are rejected as possible duplicates)."""
+    def __init__(self, capacity, error_rate=1e-4):
+        self.m = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def probe(self, key):
+        h = hash(key)                                          # double hashing from the two 32-bit halves
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32 & 0xFFFFFFFF) | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def has(self, probe):
+        bits = self.bits
+        for p in probe:
+            if not bits[p >> 3] >> (p & 7) & 1: return False
+        return True
+
+    def put(self, probe):
+        bits = self.bits
+        for p in probe: bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key): return self.has(self.probe(key))
+    def add(self, key): self.put(self.probe(key))
+
+def _opened(f, mode):
+    return open(f, mode, newline="", encoding="utf-8") if isinstance(f, (str, bytes)) or hasattr(f, "__fspath__") else nullcontext(f)
+
+def import_users(source, accepted, rejected, chunk_size=10_000, dedupe="exact", expected_rows=1_000_000, error_rate=1e-4):
+    """Stream a users CSV (username,email,password) through register_user in chunks.
+
+    Rows that pass and whose username and email (case-insensitive) were not seen before go to `accepted`;
+    the rest go to `rejected` with a reason column. Only one chunk is held at a time, so memory is bounded
+    by chunk_size plus the duplicate index (dedupe="exact": grows with unique users; dedupe="bloom":
+    fixed for expected_rows). Paths or open text files are accepted. Returns per-stage counts and rows/s.
+    """
+    bloom = dedupe == "bloom"
+    usernames, emails = (BloomFilter(expected_rows, error_rate), BloomFilter(expected_rows, error_rate)) if bloom else (ExactIndex(), ExactIndex())
+    dup = "possible_duplicate_" if bloom else "duplicate_"
+    stats = {stage: {"rows": 0, "seconds": 0.0} for stage in ("read", "validate", "dedupe", "write")}
+    stats["accepted"] = 0
+    def tick(stage, t0, rows):
+        stats[stage]["rows"] += rows
+        stats[stage]["seconds"] += time.perf_counter() - t0
+    with _opened(source, "r") as src, _opened(accepted, "w") as ok_file, _opened(rejected, "w") as bad_file:
+        reader = csv.DictReader(src)
+        ok_writer, bad_writer = csv.writer(ok_file), csv.writer(bad_file)
+        ok_writer.writerow(FIELDS)
+        bad_writer.writerow(FIELDS + ["reason"])
+        while True:
+            t0 = time.perf_counter()
+            chunk = [[row.get(f) or "" for f in FIELDS] for row in islice(reader, chunk_size)]
+            tick("read", t0, len(chunk))
+            if not chunk: break
+            t0 = time.perf_counter()
+            valid, bad = [], []
+            for row in chunk:
+                if register_user(*row): valid.append(row)
+                else: bad.append(row + ["invalid"])
+            tick("validate", t0, len(chunk))
+            t0 = time.perf_counter()
+            ok = []
+            for row in valid:
+                user, email = usernames.probe(row[0].lower()), emails.probe(row[1].lower())
+                if usernames.has(user): bad.append(row + [dup + "username"])
+                elif emails.has(email): bad.append(row + [dup + "email"])
+                else:
+                    usernames.put(user)
+                    emails.put(email)
+                    ok.append(row)
+            tick("dedupe", t0, len(valid))
+            t0 = time.perf_counter()
+            ok_writer.writerows(ok)
+            bad_writer.writerows(bad)
+            tick("write", t0, len(chunk))
+            stats["accepted"] += len(ok)
+    stats["rejected"] = stats["read"]["rows"] - stats["accepted"]
+    for stage in ("read", "validate", "dedupe", "write"):
+        s = stats[stage]
+        s["rows_per_s"] = s["rows"] / s["seconds"] if s["seconds"] else 0.0
+    return stats
+
+
+%%writefile test_registration_import.py           # saves this code snippet as a file in Colab
+
+import csv, io, pytest
+from registration_import import BloomFilter, import_users
+
+ROWS = [("alice", "alice@example.com", "pw1"), ("bob", "bob@example.com", "pw2"),
+        ("ALICE", "alice2@example.com", "pw3"),                  # username taken (case-insensitive)
+        ("carol", "Bob@Example.com", "pw4"),                     # email taken
+        ("dave", "daveexample.com", "pw5"), ("", "x@example.com", "pw6"),   # invalid
+        ("erin", "erin@example.com", "pw7")]
+
+def as_csv(rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows([("username", "email", "password"), *rows])
+    buf.seek(0)
+    return buf
+
+@pytest.mark.parametrize("dedupe", ["exact", "bloom"])
+def test_import_splits_accepted_and_rejected(dedupe):
+    accepted, rejected = io.StringIO(), io.StringIO()
+    stats = import_users(as_csv(ROWS), accepted, rejected, chunk_size=2, dedupe=dedupe, expected_rows=1000)
+    ok = list(csv.reader(io.StringIO(accepted.getvalue())))[1:]
+    bad = {r[0] + "|" + r[1]: r[3] for r in list(csv.reader(io.StringIO(rejected.getvalue())))[1:]}
+    assert [r[0] for r in ok] == ["alice", "bob", "erin"]
+    prefix = "possible_duplicate_" if dedupe == "bloom" else "duplicate_"
+    assert bad == {"ALICE|alice2@example.com": prefix + "username", "carol|Bob@Example.com": prefix + "email",
+                   "dave|daveexample.com": "invalid", "|x@example.com": "invalid"}
+    assert stats["accepted"] == 3 and stats["rejected"] == 4 and stats["read"]["rows"] == 7
+
+def test_import_from_and_to_paths(tmp_path):
+    src = tmp_path / "users.csv"
+    src.write_text(as_csv(ROWS).getvalue())
+    stats = import_users(src, tmp_path / "ok.csv", tmp_path / "bad.csv")
+    assert stats["accepted"] == 3 and len((tmp_path / "bad.csv").read_text().splitlines()) == 5
+
+def test_bloom_filter_has_no_false_negatives_and_fixed_size():
+    bloom = BloomFilter(10_000, error_rate=0.01)
+    size = len(bloom.bits)
+    for i in range(10_000): bloom.add(f"user{i}")
+    assert all(f"user{i}" in bloom for i in range(10_000)) and len(bloom.bits) == size
+    assert sum(f"other{i}" in bloom for i in range(10_000)) < 300
+
+
+%%writefile bench_registration_import.py           # saves this code snippet as a file in Colab
+
+import csv, os, random, sys, tempfile, time, tracemalloc
+from registration_import import import_users
+
+def write_users(path, n):                                      # ~2% duplicates, ~1% invalid rows
+    rnd = random.Random(5)
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["username", "email", "password"])
+        for i in range(n):
+            j = rnd.randrange(i) if i and rnd.random() < 0.02 else i
+            w.writerow([f"user{j}", f"user{j}@example.com" if rnd.random() > 0.01 else f"user{j}.example.com", "Password123!"])
+
+if __name__ == "__main__":                                    # python bench_registration_import.py [N]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    d = tempfile.mkdtemp()
+    src = os.path.join(d, "users.csv")
+    write_users(src, n)
+    run = lambda dedupe: import_users(src, os.path.join(d, "ok.csv"), os.path.join(d, "bad.csv"), dedupe=dedupe, expected_rows=n)
+    for dedupe in ("exact", "bloom"):
+        t0 = time.perf_counter()
+        stats = run(dedupe)
+        elapsed = time.perf_counter() - t0
+        tracemalloc.start()                                    # second pass only for memory: tracing slows every allocation
+        run(dedupe)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        stages = "  ".join(f"{k} {stats[k]['rows_per_s']:>9.0f}/s" for k in ("read", "validate", "dedupe", "write"))
+        print(f"{dedupe:>6}: {n/elapsed:>8.0f} rows/s  peak {peak/2**20:>6.1f} MiB  accepted {stats['accepted']}  rejected {stats['rejected']}  |  {stages}")
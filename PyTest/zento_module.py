@@ -0,0 +1,223 @@
+# --------------------- SIMULATED ZENTO EXPENSE APP (used by expense_automation.py) -----------------------
+
+import csv, io, itertools
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as _date
+from claim_rules import RuleSet
+from receipt_store import ReceiptStore
+
+CSV_HEADER = ["id", "title", "date", "category", "amount", "status", "employee"]
+
+class _Queue:
+    """Append-only (seq, claim_id) entries, sorted because seq only grows. A claim leaving the
+    queue just bumps its seq, making its entry stale; stale entries are dropped in bulk."""
+    __slots__ = ("entries", "live")
+    def __init__(self): self.entries, self.live = [], 0
+
+class ZentoApp:
+    PER_DIEM = {"Meals": 200.0}
+
+    def __init__(self, receipt_root=None, rules=None):
+        self.users = {"alice": ("employee", "alicepwd"), "manager1": ("manager", "managerpwd"), "finance1": ("finance", "financepwd")}
+        self.profiles = {"alice": {"email": "alice@example.com"}, "manager1": {"email": "manager1@example.com"}}
+        self.approvers = {"alice": "manager1"}
+        self.rules = RuleSet(rules if rules is not None else
+                             [{"kind": "limit", "category": c, "max": cap} for c, cap in self.PER_DIEM.items()])
+        self._session_ids = itertools.count(1)
+        self.sessions = {}
+        self._claim_ids = itertools.count(1)
+        self.claims = {}
+        self.receipts = {}        # claim_id -> [(filename, digest, size)]; blobs live in receipt_store
+        self.receipt_store = ReceiptStore(receipt_root)
+        self._report_ids = itertools.count(1)
+        self.reports = {}
+        self._by_date = []        # sorted [(iso date, claim_id)]: date-range reports are two bisects
+        self._seq = itertools.count(1)
+        self._queues = {}         # ("status", s) / ("approver", name) -> _Queue
+        self._in_queues = {}      # claim_id -> queue keys it is live in
+        self._changes = _Queue()  # every transition; a claim's latest one is its only live entry
+
+    def ping_homepage(self): return True
+
+    def login(self, role, username, password):
+        if self.users.get(username) != (role, password): raise ValueError("Invalid credentials")
+        token = f"session_{next(self._session_ids)}"
+        self.sessions[token] = {"user": username, "role": role}
+        return token
+
+    def _session(self, session, *roles):
+        s = self.sessions.get(session)
+        if s is None: raise ValueError("Invalid session")
+        if roles and s["role"] not in roles: raise PermissionError(f"{s['role']} cannot do this")
+        return s
+
+    def _claim(self, claim_id):
+        if claim_id not in self.claims: raise ValueError("Invalid claim")
+        return self.claims[claim_id]
+
+    # ---------- employee
+    def create_claim(self, session, title, amount, date, category):
+        s = self._session(session, "employee")
+        day = _date.fromisoformat(date).isoformat()
+        claim_id = next(self._claim_ids)
+        self.claims[claim_id] = {"id": claim_id, "title": title, "amount": float(amount), "date": day, "category": category,
+                                 "status": None, "employee": s["user"], "approver": self.approvers.get(s["user"])}
+        insort(self._by_date, (day, claim_id))
+        self._move(self.claims[claim_id], "Created")
+        return claim_id
+
+    def _move(self, claim, status):
+        """O(1): leave the old queues (entries go stale), append to the new status queue, and to the
+        approver's queue while Submitted."""
+        claim_id = claim["id"]
+        claim["status"], claim["seq"] = status, next(self._seq)
+        for key in self._in_queues.pop(claim_id, ()):
+            self._queues[key].live -= 1
+            self._compact(self._queues[key])
+        keys = [("status", status)]
+        if status == "Submitted" and claim["approver"]: keys.append(("approver", claim["approver"]))
+        for queue in [self._queues.setdefault(key, _Queue()) for key in keys] + [self._changes]:
+            queue.entries.append((claim["seq"], claim_id))
+            queue.live += 1
+        self._in_queues[claim_id] = keys
+        self._changes.live = len(self.claims)
+        self._compact(self._changes)
+
+    def _compact(self, queue):
+        if len(queue.entries) > 2 * queue.live + 1024:
+            queue.entries = [e for e in queue.entries if self.claims[e[1]]["seq"] == e[0]]
+
+    def _page(self, queue, cursor, limit):
+        entries, page = queue.entries if queue else [], []
+        i = bisect_right(entries, (cursor, float("inf")))
+        while i < len(entries) and len(page) < limit:
+            seq, claim_id = entries[i]
+            if self.claims[claim_id]["seq"] == seq: page.append(self.claims[claim_id])
+            cursor, i = seq, i + 1
+        return {"claims": page, "cursor": cursor, "more": i < len(entries)}
+
+    def submit_claim(self, session, claim_id):
+        s = self._session(session, "employee")
+        claim = self._claim(claim_id)
+        if claim["employee"] != s["user"]: raise PermissionError("Not your claim")
+        if claim["status"] != "Created": raise ValueError(f"Cannot submit a {claim['status']} claim")
+        self._move(claim, "Submitted")
+        return True
+
+    def upload_receipt(self, session, claim_id, filename, content):
+        """content may be bytes, a file-like, or an iterable of chunks; identical receipts share one blob."""
+        self._session(session, "employee")
+        self._claim(claim_id)
+        digest, size = self.receipt_store.put(content)
+        self.receipts.setdefault(claim_id, []).append((filename, digest, size))
+        return True
+
+    def get_claim_receipts(self, claim_id):
+        return [{"filename": name, "digest": digest, "size": size, "content": self.receipt_store.view(digest)}
+                for name, digest, size in self.receipts.get(claim_id, [])]
+
+    def get_claim_status(self, claim_id): return self.claims.get(claim_id, {}).get("status", "Unknown")
+
+    def validate_claim(self, claim_id):
+        claim = self._claim(claim_id)
+        peers = [claim]
+        if self.rules.needs_peers:
+            peers = [self.claims[cid] for cid in self._ids_between(claim["date"], claim["date"])
+                     if self.claims[cid]["employee"] == claim["employee"]]
+        return self.rules.check_many(peers).get(claim_id, [])
+
+    def validate_claims(self, claim_ids=None, start_date=None, end_date=None):
+        """Validate many claims in one pass: {claim_id: [issues]} for those that break a rule.
+        Pick claims by id, by date range (whole days, so daily caps see every claim), or pass neither for all."""
+        if claim_ids is not None: claims = [self._claim(cid) for cid in claim_ids]
+        elif start_date or end_date:
+            claims = [self.claims[cid] for cid in self._ids_between(start_date or "0001-01-01", end_date or "9999-12-31")]
+        else: claims = self.claims.values()
+        return self.rules.check_many(claims)
+
+    def update_user_profile(self, session, username, new_profile):
+        s = self._session(session)
+        if s["user"] != username: raise PermissionError("Can only edit your own profile")
+        self.profiles.setdefault(username, {}).update(new_profile)
+        return True
+
+    # ---------- manager / finance
+    def list_pending_claims(self, session):
+        s = self._session(session, "manager")
+        return [self.claims[cid] for seq, cid in self._queues.get(("approver", s["user"]), _Queue()).entries
+                if self.claims[cid]["seq"] == seq]
+
+    def pending_claims_page(self, session, cursor=0, limit=50):
+        """The caller's approval queue in submit order, `limit` at a time. Pass back the returned
+        cursor for the next page; polling with the last cursor returns only newly submitted claims."""
+        s = self._session(session, "manager")
+        return self._page(self._queues.get(("approver", s["user"])), cursor, limit)
+
+    def claims_page(self, session, status, cursor=0, limit=50):
+        self._session(session, "manager", "finance")
+        return self._page(self._queues.get(("status", status)), cursor, limit)
+
+    def changes_since(self, session, cursor=0, limit=500):
+        """Claims whose status changed after `cursor`, each once in its latest state."""
+        self._session(session, "manager", "finance")
+        return self._page(self._changes, cursor, limit)
+
+    def manager_approve(self, session, claim_id, comment=""):
+        self._session(session, "manager")
+        claim = self._claim(claim_id)
+        if claim["status"] not in ("Created", "Submitted"): raise ValueError(f"Cannot approve a {claim['status']} claim")
+        claim["manager_comment"] = comment
+        self._move(claim, "Approved")
+        return True
+
+    def finance_process_payment(self, claim_id, payment_ref):
+        claim = self._claim(claim_id)
+        if claim["status"] != "Approved": raise ValueError("Claim not approved")
+        claim["payment_ref"] = payment_ref
+        self._move(claim, "Paid")
+        return True
+
+    # ---------- reports
+    def generate_expense_report(self, start_date, end_date):
+        """Claims dated start_date..end_date (inclusive), found by bisecting the date index.
+        Totals by category and status are accumulated in the same pass; the report keeps
+        the matching claim ids in a compact array for export."""
+        ids = array("q")
+        total, by_category, by_status = 0.0, {}, {}
+        for claim_id in self._ids_between(start_date, end_date):
+            c = self.claims[claim_id]
+            ids.append(claim_id)
+            total += c["amount"]
+            by_category[c["category"]] = by_category.get(c["category"], 0.0) + c["amount"]
+            by_status[c["status"]] = by_status.get(c["status"], 0.0) + c["amount"]
+        report_id = next(self._report_ids)
+        self.reports[report_id] = {"id": report_id, "start_date": start_date, "end_date": end_date, "count": len(ids),
+                                   "total_amount": total, "by_category": by_category, "by_status": by_status, "claim_ids": ids}
+        return self.reports[report_id]
+
+    def _ids_between(self, start_date, end_date):
+        lo = bisect_left(self._by_date, (_date.fromisoformat(start_date).isoformat(),))
+        hi = bisect_right(self._by_date, (_date.fromisoformat(end_date).isoformat(), float("inf")))
+        for i in range(lo, hi): yield self._by_date[i][1]
+
+    def iter_report_csv(self, report_id, chunk_rows=1000):
+        """Yields the report CSV in chunks of `chunk_rows` lines, so memory stays flat for any report size."""
+        if report_id not in self.reports: raise ValueError("Invalid report")
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+        for n, claim_id in enumerate(self.reports[report_id]["claim_ids"], start=1):
+            c = self.claims[claim_id]
+            writer.writerow([c[k] for k in CSV_HEADER])
+            if n % chunk_rows == 0:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        if buf.tell(): yield buf.getvalue()
+
+    def export_report_csv(self, report_id, out=None):
+        """CSV text of the report, or stream it into file-like `out` and return the number of data rows."""
+        if out is None: return "".join(self.iter_report_csv(report_id))
+        for chunk in self.iter_report_csv(report_id): out.write(chunk)
+        return self.reports[report_id]["count"]
@@ -0,0 +1,113 @@
+"""
+Failure artifacts (screenshot, page source, browser console) written by a background thread.
+The failing test only grabs the bytes from the browser and queues them; hashing, gzip and disk
+writes happen off the test path. Files are named <test>__<worker>__<kind>, identical content is
+hard-linked instead of rewritten, and the artifact directory is kept under its disk budget (shared by
+every worker and run) by pruning the oldest files.
+"""
+
+import atexit, gzip, hashlib, itertools, json, os, queue, re, threading
+from multiprocessing.util import Finalize
+from selenium.common.exceptions import WebDriverException
+
+class ArtifactCollector:
+    def __init__(self, out_dir=None, max_bytes=None, queue_size=64):
+        self.out_dir = out_dir or os.getenv("SELENIUM_ARTIFACT_DIR", "artifacts")
+        self.max_bytes = max_bytes or int(os.getenv("SELENIUM_ARTIFACT_MAX_MB", "200")) * 2**20
+        self.pid = os.getpid()
+        self.worker = os.getenv("PYTEST_XDIST_WORKER") or f"pid{self.pid}"
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._by_hash = {}             # sha256 -> path already on disk
+        self._seq = itertools.count(1)
+        self.used = 0
+        self.stats = {"queued": 0, "written": 0, "deduplicated": 0, "dropped": 0, "pruned": 0}
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def capture(self, driver, test_name):
+        """Grab screenshot, DOM and console from `driver` and hand them to the writer. Never raises."""
+        grabs = [("screenshot.png", lambda: driver.get_screenshot_as_png()),
+                 ("page.html.gz", lambda: driver.page_source.encode("utf-8")),
+                 ("console.json.gz", lambda: json.dumps(driver.get_log("browser")).encode("utf-8"))]
+        for kind, grab in grabs:
+            try: data = grab()
+            except (WebDriverException, ValueError): continue     # dead browser / driver without logs
+            self.submit(test_name, kind, data)
+
+    def submit(self, test_name, kind, data):
+        try:
+            self._queue.put_nowait((test_name, kind, data))
+            self.stats["queued"] += 1
+        except queue.Full: self.stats["dropped"] += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None: return
+                self._write(*item)
+            except OSError: self.stats["dropped"] += 1
+            finally: self._queue.task_done()
+
+    def _write(self, test_name, kind, data):
+        safe = re.sub(r"[^\w.-]+", "_", test_name)[:120]
+        path = os.path.join(self.out_dir, f"{safe}__{self.worker}__{next(self._seq):04d}__{kind}")
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._by_hash.get(digest)
+        if existing is not None:
+            try:
+                os.link(existing, path)             # same bytes as an earlier failure: no new disk use
+                self.stats["deduplicated"] += 1
+                return
+            except OSError: pass
+        payload = gzip.compress(data, compresslevel=5) if kind.endswith(".gz") else data     # PNG is already deflated
+        if not self._make_room(len(payload)):
+            self.stats["dropped"] += 1
+            return
+        with open(path, "wb") as f: f.write(payload)
+        self.used += len(payload)
+        self._by_hash[digest] = path
+        self.stats["written"] += 1
+
+    def _make_room(self, need):
+        """Delete the oldest files in out_dir, whoever wrote them, until `need` more bytes fit under max_bytes.
+        Usage is re-read from disk each time because other workers write to the same directory."""
+        if need > self.max_bytes: return False
+        files = {}                     # inode -> [mtime, size, paths]: hard-linked copies take space once
+        for entry in os.scandir(self.out_dir):
+            try:
+                if not entry.is_file(): continue
+                st = entry.stat()
+            except OSError: continue                # pruned by another worker meanwhile
+            files.setdefault((st.st_dev, st.st_ino), [st.st_mtime, st.st_size, []])[2].append(entry.path)
+        self.used = sum(f[1] for f in files.values())
+        for mtime, size, paths in sorted(files.values()):
+            if self.used + need <= self.max_bytes: break
+            for path in paths:
+                try: os.remove(path)
+                except OSError: pass
+            self.used -= size
+            self.stats["pruned"] += len(paths)
+        return self.used + need <= self.max_bytes
+
+    def flush(self): self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+_collector = None
+
+def collector():
+    """Process-wide collector, flushed at exit. Registered with both atexit (pytest, scripts) and
+    multiprocessing's Finalize, since pool workers such as run_parallel's skip atexit handlers."""
+    global _collector
+    if _collector is None or _collector.pid != os.getpid():     # a forked child inherits no writer thread
+        _collector = ArtifactCollector()
+        atexit.register(_collector.close)
+        Finalize(None, _collector.close, exitpriority=30)
+    return _collector
+
+def capture_failure(driver, test_name): collector().capture(driver, test_name)
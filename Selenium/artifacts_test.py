@@ -0,0 +1,78 @@
+"""
+ArtifactCollector against a fake driver: naming, compression, dedup, the shared disk budget and shutdown.
+"""
+
+import gzip, json, os
+import pytest
+from selenium.common.exceptions import WebDriverException
+from artifacts import ArtifactCollector
+
+class FakeDriver:
+    page_source = "<html><body>" + "<div class='product-card'>Phone</div>" * 200 + "</body></html>"
+    def __init__(self, screenshot=b"\x89PNG fake screenshot"): self.screenshot = screenshot
+    def get_screenshot_as_png(self): return self.screenshot
+    def get_log(self, kind): return [{"level": "SEVERE", "message": "checkout.js: TypeError"}]
+
+class DeadDriver(FakeDriver):
+    def get_screenshot_as_png(self): raise WebDriverException("browser gone")
+
+@pytest.fixture
+def make_collector(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    made = []
+    def make(**kwargs):
+        made.append(ArtifactCollector(out_dir=str(tmp_path / "artifacts"), **kwargs))
+        return made[-1]
+    yield make
+    for collector in made: collector.close()
+
+def test_capture_names_files_per_test_and_worker_and_gzips_text(make_collector):
+    collector = make_collector()
+    collector.capture(FakeDriver(), "ecommerce_test.py::test_checkout[chrome]")
+    collector.capture(DeadDriver(), "test_dead")                # screenshot fails, the rest is still captured
+    collector.flush()
+    names = sorted(os.listdir(collector.out_dir))
+    assert names == ["ecommerce_test.py_test_checkout_chrome___gw3__0001__screenshot.png",
+                     "ecommerce_test.py_test_checkout_chrome___gw3__0002__page.html.gz",
+                     "ecommerce_test.py_test_checkout_chrome___gw3__0003__console.json.gz",
+                     "test_dead__gw3__0004__page.html.gz", "test_dead__gw3__0005__console.json.gz"]
+    path = lambda name: os.path.join(collector.out_dir, name)
+    with open(path(names[0]), "rb") as f: assert f.read() == b"\x89PNG fake screenshot"      # PNG stored as is
+    with gzip.open(path(names[1])) as f: assert f.read().decode() == FakeDriver.page_source
+    with gzip.open(path(names[2])) as f: assert json.load(f)[0]["level"] == "SEVERE"
+    assert os.path.getsize(path(names[1])) < len(FakeDriver.page_source) // 10
+    assert collector.stats == {"queued": 5, "written": 3, "deduplicated": 2, "dropped": 0, "pruned": 0}   # same DOM and log twice
+
+def test_identical_content_is_hard_linked(make_collector):
+    collector = make_collector()
+    for test in ("test_a", "test_b"): collector.submit(test, "screenshot.png", b"same pixels")
+    collector.flush()
+    a, b = (os.stat(os.path.join(collector.out_dir, n)) for n in sorted(os.listdir(collector.out_dir)))
+    assert (a.st_ino, a.st_nlink) == (b.st_ino, 2) and collector.stats["deduplicated"] == 1
+
+def test_oldest_files_are_pruned_under_the_shared_budget(make_collector, tmp_path):
+    out = tmp_path / "artifacts"
+    out.mkdir()
+    (out / "old_run__gw0__0001__screenshot.png").write_bytes(b"o" * 300)      # another worker's oldest file,
+    os.link(out / "old_run__gw0__0001__screenshot.png", out / "old_run__gw0__0002__screenshot.png")   # linked once
+    (out / "newer__gw1__0001__screenshot.png").write_bytes(b"n" * 300)
+    os.utime(out / "old_run__gw0__0001__screenshot.png", (1, 1))
+    os.utime(out / "newer__gw1__0001__screenshot.png", (2, 2))
+    collector = make_collector(max_bytes=1000)
+    collector.submit("t1", "screenshot.png", b"1" * 350)        # 600 on disk (link counted once) + 350 fits
+    collector.flush()
+    assert len(os.listdir(out)) == 4 and collector.stats["pruned"] == 0
+    collector.submit("t2", "screenshot.png", b"2" * 350)        # 1300: the oldest file and its link go
+    collector.submit("t3", "screenshot.png", b"3" * 2000)       # bigger than the whole budget: dropped
+    collector.flush()
+    assert sorted(os.listdir(out)) == ["newer__gw1__0001__screenshot.png", "t1__gw3__0001__screenshot.png",
+                                       "t2__gw3__0002__screenshot.png"]
+    assert collector.stats["pruned"] == 2 and collector.stats["dropped"] == 1 and collector.used == 1000
+
+def test_close_drains_the_queue_and_stops_the_writer(make_collector):
+    collector = make_collector()
+    for n in range(20): collector.submit(f"test_{n}", "console.json.gz", json.dumps([n]).encode())
+    collector.close()
+    assert not collector._thread.is_alive() and collector.stats["written"] == 20
+    assert len(os.listdir(collector.out_dir)) == 20
+    collector.close()                                           # idempotent
@@ -0,0 +1,37 @@
+"""
+Wall time for N short flows: launching Chrome per test (the old setup) vs borrowing from DriverPool.
+Run: python bench_driver_pool.py [N]
+"""
+
+import sys, time
+from selenium import webdriver
+from driver_pool import DriverPool, headless_chrome_options
+
+PAGE = "data:text/html,<input name='q'><div class='product-card'><a href='#'>Phone</a></div>"
+
+def flow(driver):
+    driver.get(PAGE)
+    assert driver.find_element("css selector", ".product-card a").text == "Phone"
+
+def per_test_launch(n):
+    for _ in range(n):
+        driver = webdriver.Chrome(options=headless_chrome_options())
+        try: flow(driver)
+        finally: driver.quit()
+
+def pooled(n, size=2):
+    with DriverPool(size=size) as pool:
+        pool.warm()
+        for _ in range(n):
+            with pool.driver() as driver: flow(driver)
+        return pool.stats
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    t0 = time.perf_counter()
+    per_test_launch(n)
+    launch = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    stats = pooled(n)
+    pool = time.perf_counter() - t0
+    print(f"{n} flows: per-test launch {launch:.1f}s, pooled {pool:.1f}s ({launch/pool:.1f}x)  {stats}")
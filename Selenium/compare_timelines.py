@@ -0,0 +1,64 @@
+"""
+Flags flow steps that got slower than a stored baseline.
+  python compare_timelines.py --save-baseline baseline.json timelines/     # median of the runs found
+  python compare_timelines.py baseline.json timelines/                     # exit code 1 on regressions
+A step regresses when it is both --ratio times and --min-delta seconds slower than the baseline median.
+"""
+
+import argparse, glob, json, os, statistics, sys
+
+def load_runs(paths):
+    runs = []
+    for p in paths:
+        files = sorted(glob.glob(os.path.join(p, "*.json"))) if os.path.isdir(p) else [p]
+        for f in files:
+            with open(f) as fh: runs.append(json.load(fh))
+    return runs
+
+def medians(runs):
+    """{flow: {step: {"seconds": median, "load_ms": median or None}}} over passed runs."""
+    samples = {}
+    for run in runs:
+        if run.get("status") != "passed": continue
+        for step in run["steps"]:
+            s = samples.setdefault(run["flow"], {}).setdefault(step["step"], {"seconds": [], "load_ms": []})
+            s["seconds"].append(step["seconds"])
+            load_ms = (step.get("navigation") or {}).get("load_ms")
+            if load_ms: s["load_ms"].append(load_ms)      # 0 / null: captured before the load event ended
+    return {flow: {name: {k: (statistics.median(v) if v else None) for k, v in s.items()} for name, s in steps.items()}
+            for flow, steps in samples.items()}
+
+def compare(baseline, current, ratio=1.25, min_delta=0.05):
+    regressions = []
+    for flow, steps in current.items():
+        for name, now in steps.items():
+            base = baseline.get(flow, {}).get(name)
+            if base is None: continue
+            for key, floor in (("seconds", min_delta), ("load_ms", min_delta * 1000)):
+                b, c = base.get(key), now.get(key)
+                if not b or c is None: continue      # no usable baseline (absent, or 0 from an old file)
+                if c > b * ratio and c - b > floor: regressions.append((flow, name, key, b, c))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", nargs="?")
+    parser.add_argument("runs", nargs="+")
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--ratio", type=float, default=1.25)
+    parser.add_argument("--min-delta", type=float, default=0.05, help="seconds")
+    args = parser.parse_args(argv)
+    if args.save_baseline:
+        runs = ([args.baseline] if args.baseline else []) + args.runs
+        with open(args.save_baseline, "w") as f: json.dump(medians(load_runs(runs)), f, indent=2)
+        print("baseline written to", args.save_baseline)
+        return 0
+    with open(args.baseline) as f: baseline = json.load(f)
+    regressions = compare(baseline, medians(load_runs(args.runs)), args.ratio, args.min_delta)
+    for flow, step, key, b, c in regressions:
+        print(f"SLOWER {flow} / {step}: {key} {b:.3f} -> {c:.3f} ({c/b:.2f}x)")
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+compare_timelines on synthetic timeline files: pure Python, no browser involved.
+"""
+
+import json
+import pytest
+from compare_timelines import compare, load_runs, main, medians
+
+def timeline(seconds, load_ms=None, flow="checkout", status="passed"):
+    step = {"step": "search", "status": "ok", "seconds": seconds}
+    if load_ms is not False: step["navigation"] = {"url": "http://shop.test/", "load_ms": load_ms}
+    return {"flow": flow, "status": status, "steps": [step]}
+
+def write_runs(directory, runs):
+    directory.mkdir()
+    for n, run in enumerate(runs): (directory / f"run{n}.json").write_text(json.dumps(run))
+    return str(directory)
+
+def test_baseline_is_the_median_of_passed_runs(tmp_path):
+    runs = load_runs([write_runs(tmp_path / "base", [timeline(1.0, 400), timeline(3.0, 600), timeline(2.0, 500),
+                                                      timeline(9.0, 9000, status="failed")])])
+    assert medians(runs) == {"checkout": {"search": {"seconds": 2.0, "load_ms": 500}}}
+
+def test_regression_needs_both_ratio_and_min_delta():
+    base = {"checkout": {"search": {"seconds": 0.1, "load_ms": None}}}
+    slower = lambda s: medians([timeline(s, False)])
+    assert compare(base, slower(0.14), ratio=1.25, min_delta=0.05) == []        # 1.4x but only 40 ms slower
+    assert compare(base, slower(0.149), ratio=1.5, min_delta=0.01) == []        # 49 ms but under 1.5x
+    assert compare(base, slower(0.2), ratio=1.25, min_delta=0.05) == [("checkout", "search", "seconds", 0.1, 0.2)]
+
+@pytest.mark.parametrize("load_ms", [0, None, False])
+def test_zero_or_missing_load_ms_is_skipped(load_ms):
+    assert medians([timeline(1.0, load_ms)])["checkout"]["search"]["load_ms"] is None
+    old_file_baseline = {"checkout": {"search": {"seconds": 1.0, "load_ms": 0}}}
+    assert compare(old_file_baseline, medians([timeline(1.0, 900)])) == []      # no ZeroDivisionError, no false flag
+
+def test_cli_saves_a_baseline_and_exits_1_on_regression(tmp_path, capsys):
+    baseline = str(tmp_path / "baseline.json")
+    assert main(["--save-baseline", baseline, write_runs(tmp_path / "base", [timeline(1.0, 500)] * 3)]) == 0
+    assert main([baseline, write_runs(tmp_path / "same", [timeline(1.01, 510)])]) == 0
+    assert main([baseline, write_runs(tmp_path / "slow", [timeline(2.0, 1500)])]) == 1
+    out = capsys.readouterr().out
+    assert "SLOWER checkout / search: seconds 1.000 -> 2.000 (2.00x)" in out and "2 regression(s)" in out
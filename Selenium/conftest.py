@@ -0,0 +1,37 @@
+"""
+pytest fixtures for the Selenium flows: one warmed DriverPool per run, one pooled driver per test.
+Pool size and recycling come from SELENIUM_POOL_SIZE / SELENIUM_DRIVER_MAX_USES.
+SELENIUM_STANDIN=1 points every flow at the bundled local stand-in server instead of the real sites.
+"""
+
+import os, tempfile, pytest
+from driver_pool import DriverPool
+from standin_server import StandinServer
+
+def use_standin_receipt():
+    if os.getenv("TEST_RECEIPT_PATH"): return
+    fd, path = tempfile.mkstemp(suffix=".jpg")
+    with os.fdopen(fd, "wb") as f: f.write(b"\xff\xd8\xff\xe0 stand-in receipt")
+    os.environ["TEST_RECEIPT_PATH"] = path
+
+@pytest.fixture(scope="session", autouse=True)
+def standin_site():
+    if os.getenv("SELENIUM_STANDIN") != "1":
+        yield None
+        return
+    with StandinServer() as server:
+        server.export_env()
+        use_standin_receipt()
+        yield server
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    pool = DriverPool()
+    pool.warm(1)
+    yield pool
+    pool.close()
+
+@pytest.fixture
+def driver(driver_pool):
+    with driver_pool.driver() as d:
+        yield d
@@ -0,0 +1,143 @@
+"""
+Shared pool of warmed headless Chrome drivers for the Selenium flows.
+Drivers are reset between tests (extra windows, cookies, storage, cache for every origin they visited)
+and recycled after N uses or when they crash.
+"""
+
+import os, queue, threading, time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+def headless_chrome_options():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")           # run headless in CI
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    return options
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else None
+
+class DriverPool:
+    def __init__(self, size=None, max_uses=None, make_driver=None, origins=()):
+        self.size = size or int(os.getenv("SELENIUM_POOL_SIZE", "2"))
+        self.max_uses = max_uses or int(os.getenv("SELENIUM_DRIVER_MAX_USES", "50"))
+        self.make_driver = make_driver or (lambda: webdriver.Chrome(options=headless_chrome_options()))
+        self.origins = set(origins)          # always cleared on reset, on top of the ones a driver is seen visiting
+        self._idle = []                      # stack, most recently used on top: its caches are warmest
+        self._uses = {}                      # driver -> number of tests it has served
+        self._cond = threading.Condition()   # guards _idle/_created; notified when a driver or a slot frees up
+        self._created = 0                    # running drivers plus slots reserved for launches in progress
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "crashed": 0}
+
+    def warm(self, n=None):
+        """Start drivers up front so the first tests don't pay the launch."""
+        for _ in range(n or self.size):
+            with self._cond:
+                if self._created >= self.size: return
+                self._created += 1
+            self._put_idle(self._launch())
+
+    def _launch(self):
+        # the caller has already reserved the slot (_created); hand it back if the launch fails
+        try: driver = self.make_driver()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[driver] = 0
+            self.stats["launched"] += 1
+        return driver
+
+    def _put_idle(self, driver):
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    def acquire(self, timeout=None):
+        """An idle driver, else a new one while under `size`, else wait for either: a released driver, or a slot
+        freed when a driver is recycled or crashes. Raises queue.Empty after `timeout` seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0: raise queue.Empty
+                self._cond.wait(remaining)
+            if self._idle: driver = self._idle.pop()
+            else:
+                self._created += 1            # reserve the slot before launching, so concurrent acquires can't overshoot
+                driver = None
+        if driver is None: driver = self._launch()
+        with self._cond:
+            if self._uses[driver]: self.stats["reused"] += 1
+            self._uses[driver] += 1
+        return driver
+
+    def release(self, driver, broken=False):
+        if not broken and self._uses.get(driver, 0) < self.max_uses:
+            try:
+                self._reset(driver)
+                self._put_idle(driver)
+                return
+            except WebDriverException: broken = True
+        with self._cond: self.stats["crashed" if broken else "recycled"] += 1
+        self._discard(driver)
+
+    def _visited(self, driver):
+        """Origins this driver may hold storage for: every page in each window's history, plus cookie domains
+        (a test can leave an origin through navigation or a subresource, not only through the current URL)."""
+        origins = set(self.origins)
+        handles = driver.window_handles
+        for handle in handles:
+            driver.switch_to.window(handle)
+            for entry in driver.execute_cdp_cmd("Page.getNavigationHistory", {})["entries"]:
+                origins.add(_origin(entry["url"]))
+        for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]:
+            host = cookie["domain"].lstrip(".")
+            origins.update((f"http://{host}", f"https://{host}"))
+        origins.discard(None)
+        return origins
+
+    def _reset(self, driver):
+        origins = self._visited(driver)
+        old = driver.window_handles
+        driver.switch_to.new_window("tab")  # fresh about:blank tab: new sessionStorage, empty history
+        fresh = driver.current_window_handle
+        for handle in old:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+        for origin in origins:              # localStorage, IndexedDB, cache storage, service workers, ...
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})    # all domains, not just the current one
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+
+    def _discard(self, driver):
+        with self._cond:
+            self._uses.pop(driver, None)
+            self._created -= 1
+            self._cond.notify()               # a waiter in acquire() may launch into the freed slot
+        try: driver.quit()
+        except WebDriverException: pass
+
+    @contextmanager
+    def driver(self):
+        driver = self.acquire()
+        broken = False
+        try: yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally: self.release(driver, broken=broken)
+
+    def close(self):
+        with self._cond: idle, self._idle = self._idle, []
+        for driver in idle: self._discard(driver)
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
@@ -0,0 +1,75 @@
+"""
+DriverPool against a fake driver: no browser needed. Covers waiting for a slot, the size cap under
+concurrent acquires, and the per-test reset.
+"""
+
+import queue, threading, time
+import pytest
+from driver_pool import DriverPool
+
+class FakeDriver:
+    """Just enough of a WebDriver for DriverPool: window handles, CDP calls and quit()."""
+    def __init__(self, history=("about:blank",)):
+        self._windows, self.current_window_handle = ["w0"], "w0"
+        self.history, self.cdp, self.quit_called = list(history), [], False
+        self.switch_to = self
+        self._handles = 0
+
+    @property
+    def window_handles(self): return list(self._windows)         # a fresh list each call, like WebDriver
+
+    def window(self, handle): self.current_window_handle = handle
+
+    def new_window(self, kind):
+        self._handles += 1
+        self.current_window_handle = f"w{self._handles}"
+        self._windows.append(self.current_window_handle)
+
+    def close(self): self._windows.remove(self.current_window_handle)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        if cmd == "Page.getNavigationHistory": return {"entries": [{"url": url} for url in self.history]}
+        if cmd == "Network.getAllCookies": return {"cookies": [{"domain": ".shop.test"}]}
+        return {}
+
+    def quit(self): self.quit_called = True
+
+@pytest.mark.parametrize("broken", [False, True])
+def test_waiter_gets_a_new_driver_when_the_busy_one_is_recycled(broken):
+    pool = DriverPool(size=1, max_uses=1, make_driver=FakeDriver)
+    first = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)                                  # let the waiter block on the full pool
+    pool.release(first, broken=broken)                # max_uses reached / crashed: discarded, never idle again
+    waiter.join(5)
+    assert not waiter.is_alive() and got[0] is not first and first.quit_called
+    assert pool.stats == {"launched": 2, "reused": 0, "recycled": int(not broken), "crashed": int(broken)}
+
+def test_concurrent_acquires_never_launch_past_size():
+    def slow_driver():
+        time.sleep(0.02)                              # widen the window between the size check and the launch
+        return FakeDriver()
+    pool = DriverPool(size=2, max_uses=100, make_driver=slow_driver)
+    def borrow():
+        with pool.driver(): time.sleep(0.01)
+    threads = [threading.Thread(target=borrow) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join(5)
+    assert pool.stats["launched"] == 2 and pool.stats["reused"] == 6
+
+def test_acquire_times_out_when_every_driver_is_busy():
+    pool = DriverPool(size=1, make_driver=FakeDriver)
+    pool.acquire()
+    with pytest.raises(queue.Empty): pool.acquire(timeout=0.05)
+
+def test_release_resets_every_visited_origin_in_a_fresh_tab():
+    driver = FakeDriver(history=["about:blank", "http://127.0.0.1:8000/flipkart", "https://pay.test/checkout"])
+    pool = DriverPool(size=1, make_driver=lambda: driver, origins=["http://cdn.test"])
+    with pool.driver() as d: d.new_window("tab")      # the test left a second window open
+    assert driver.window_handles == ["w2"] and pool.acquire() is driver
+    cleared = {p["origin"] for cmd, p in driver.cdp if cmd == "Storage.clearDataForOrigin"}
+    assert cleared == {"http://127.0.0.1:8000", "https://pay.test", "http://shop.test", "https://shop.test", "http://cdn.test"}
+    assert ("Network.clearBrowserCookies", {}) in driver.cdp and ("Network.clearBrowserCache", {}) in driver.cdp
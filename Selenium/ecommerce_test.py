@@ -3,31 +3,33 @@ Flow: open homepage -> search for product -> open product -> add to cart -> go t
 Replace selectors and URL with the actual staging/demo env.
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os, traceback
+from artifacts import capture_failure
+from driver_pool import DriverPool
+from step_timing import FlowTimeline
+from waits import SmartWait
 
-def test_search_add_to_cart_checkout():
-    # --- setup driver (local) ---
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")           # run headless in CI
-    options.add_argument("--no-sandbox")
-    driver = webdriver.Chrome(options=options)       # or use webdriver_manager if you prefer
-
-    wait = WebDriverWait(driver, 15)
+def test_search_add_to_cart_checkout(driver):     # pooled headless driver from conftest.py
+    timeline = FlowTimeline(driver, "flipkart_checkout")     # per-step timings -> timelines/*.json
+    wait = SmartWait(driver, 15, log=timeline.waits)        # reacts to DOM changes instead of 0.5s polling
+    base_url = os.getenv("FLIPKART_BASE", "https://staging.flipkart.example")   # replace with staging/demo URL
+    status = "failed"
     try:
-        driver.get("https://staging.flipkart.example/")   # replace with staging/demo URL
+        timeline.begin("open homepage")
+        driver.get(f"{base_url}/")
 
         # 1) Ensure homepage search bar is visible
         search = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "input[name='q']")))
+        timeline.begin("search")
         search.clear()
         search.send_keys("smartphone")
         search.send_keys(Keys.ENTER)
 
         # 2) Wait for results & click first product
+        timeline.begin("open product")
         first_card = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".product-card a")))
         first_card.click()
 
@@ -36,10 +38,12 @@ def test_search_add_to_cart_checkout():
             driver.switch_to.window(driver.window_handles[-1])
 
         # 4) Add to cart
+        timeline.begin("add to cart")
         add_to_cart_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.add-to-cart")))
         add_to_cart_btn.click()
 
         # 5) Go to cart / checkout
+        timeline.begin("open cart")
         cart_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a[href*='/cart']")))
         cart_btn.click()
 
@@ -50,14 +54,17 @@ def test_search_add_to_cart_checkout():
         assert total_text and total_text.strip() != "", "Cart total missing"
 
         print("PASSED: cart total:", total_text)
+        print("Waits:", wait.summary())
+        status = "passed"
 
     except Exception:
         # Screenshot on failure (for debugging in CI)
-        driver.save_screenshot("flipkart_failure.png")
+        capture_failure(driver, "test_search_add_to_cart_checkout")     # queued; written in the background
         traceback.print_exc()
         raise
     finally:
-        driver.quit()
+        timeline.finish(status)
 
 if __name__ == "__main__":
-    test_search_add_to_cart_checkout()
+    with DriverPool(size=1) as pool, pool.driver() as driver:
+        test_search_add_to_cart_checkout(driver)
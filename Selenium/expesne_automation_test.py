@@ -2,23 +2,25 @@
 Flow: login as employee -> create a new expense claim -> upload a receipt -> verify claim status/listing.
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os, traceback
+from artifacts import capture_failure
+from driver_pool import DriverPool
+from step_timing import FlowTimeline
+from waits import SmartWait
 
-def test_create_claim_and_upload_receipt():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    driver = webdriver.Chrome(options=options)
-    wait = WebDriverWait(driver, 15)
+def test_create_claim_and_upload_receipt(driver):
+    timeline = FlowTimeline(driver, "zento_claim_upload")
+    wait = SmartWait(driver, 15, log=timeline.waits)        # reacts to DOM changes instead of 0.5s polling
 
     # Store sensitive data in env vars
     base_url = os.getenv("ZENTO_BASE", "https://staging.zento.example")
     username = os.getenv("ZENTO_EMP_USER", "alice")
     password = os.getenv("ZENTO_EMP_PASS", "alicepwd")
+    status = "failed"
     try:
+        timeline.begin("login")
         driver.get(f"{base_url}/login")
 
         # 1) Login
@@ -27,6 +29,7 @@ def test_create_claim_and_upload_receipt():
         driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
 
         # 2) Navigate to "Create Claim"
+        timeline.begin("fill claim form")
         wait.until(EC.element_to_be_clickable((By.LINK_TEXT, "Create Claim"))).click()
         # Fill form (fields may vary)
         wait.until(EC.visibility_of_element_located((By.NAME, "title"))).send_keys("Taxi to client site")
@@ -34,6 +37,7 @@ def test_create_claim_and_upload_receipt():
         driver.find_element(By.NAME, "date").send_keys("2025-09-13")
         driver.find_element(By.NAME, "category").send_keys("Travel")
 
+        timeline.begin("upload receipt")
         # 3) Upload receipt. Many apps have <input type="file"> for upload
         receipt_input = driver.find_element(By.CSS_SELECTOR, "input[type='file']")
         # Use a small test file present in CI workspace. In local runs create this file.
@@ -41,21 +45,26 @@ def test_create_claim_and_upload_receipt():
         receipt_input.send_keys(test_receipt_path)
 
         # 4) Submit claim
+        timeline.begin("submit claim")
         driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
 
+        timeline.begin("verify in My Claims")
         # 5) Verify claim appears in "My Claims" or the newly created claim page
         wait.until(EC.element_to_be_clickable((By.LINK_TEXT, "My Claims"))).click()
         # Look for claim title
         claim = wait.until(EC.visibility_of_element_located((By.XPATH, "//td[contains(text(),'Taxi to client site')]")))
         assert claim is not None
         print("PASSED: claim created and visible in My Claims")
+        print("Waits:", wait.summary())
+        status = "passed"
 
     except Exception:
-        driver.save_screenshot("zento_failure.png")
+        capture_failure(driver, "test_create_claim_and_upload_receipt")     # queued; written in the background
         traceback.print_exc()
         raise
     finally:
-        driver.quit()
+        timeline.finish(status)
 
 if __name__ == "__main__":
-    test_create_claim_and_upload_receipt()
+    with DriverPool(size=1) as pool, pool.driver() as driver:
+        test_create_claim_and_upload_receipt(driver)
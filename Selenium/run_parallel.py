@@ -0,0 +1,64 @@
+"""
+Runs the Selenium flows in parallel against the local stand-in server.
+Each worker process starts its own stand-in server and one headless browser, then takes flows
+off a shared queue, so the UI suite scales with cores and needs no network.
+Run: python run_parallel.py [--workers N] [--repeat K]
+"""
+
+import argparse, importlib, os, sys, time, traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+FLOWS = [
+    ("ecommerce_test", "test_search_add_to_cart_checkout"),
+    ("expesne_automation_test", "test_create_claim_and_upload_receipt"),
+    ("sports_eqpt_test", "test_product_enquiry_flow"),
+]
+
+_worker = {}
+
+def _start_worker():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from conftest import use_standin_receipt
+    from driver_pool import DriverPool
+    from standin_server import StandinServer
+    server = StandinServer().start()
+    # pool workers leave through multiprocessing's exit hook, not atexit: quit the browser, then the server
+    Finalize(None, server.stop, exitpriority=10)
+    server.export_env()
+    use_standin_receipt()
+    pool = DriverPool(size=1)
+    Finalize(None, pool.close, exitpriority=20)
+    pool.warm()
+    _worker.update(server=server, pool=pool)
+
+def _run_flow(module_name, func_name):
+    flow = getattr(importlib.import_module(module_name), func_name)
+    t0 = time.perf_counter()
+    try:
+        with _worker["pool"].driver() as driver: flow(driver)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return f"{module_name}::{func_name}", os.getpid(), time.perf_counter() - t0, error
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=1, help="run every flow K times (to load the pool)")
+    args = parser.parse_args(argv)
+    jobs = FLOWS * args.repeat
+    t0 = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs)), initializer=_start_worker) as pool:
+        for fut in as_completed([pool.submit(_run_flow, *job) for job in jobs]):
+            name, pid, elapsed, error = fut.result()
+            print(f"{'FAILED' if error else 'PASSED'} {name} [worker {pid}] {elapsed:.2f}s")
+            if error:
+                failed += 1
+                print(error)
+    print(f"{len(jobs) - failed} passed, {failed} failed in {time.perf_counter() - t0:.1f}s with {args.workers} workers")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
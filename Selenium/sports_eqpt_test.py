@@ -2,24 +2,29 @@
 Flow: open a product page -> assert product title & gallery -> submit enquiry form -> verify success message.
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import traceback, os
+from artifacts import capture_failure
+from driver_pool import DriverPool
+from step_timing import FlowTimeline
+from waits import SmartWait
 
-def test_product_enquiry_flow():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    driver = webdriver.Chrome(options=options)
-    wait = WebDriverWait(driver, 12)
+def test_product_enquiry_flow(driver):
+    timeline = FlowTimeline(driver, "inco_product_enquiry")
+    wait = SmartWait(driver, 12, log=timeline.waits)        # reacts to DOM changes instead of 0.5s polling
+    base_url = os.getenv("INCO_BASE", "https://inco.in")   # public Inco website
+    status = "failed"
     try:
-        driver.get("https://inco.in/")   # public Inco website
+        timeline.begin("open homepage")
+        driver.get(f"{base_url}/")
 
         # 1) Navigate to Products (example)
+        timeline.begin("open products")
         products_nav = wait.until(EC.element_to_be_clickable((By.LINK_TEXT, "Products")))
         products_nav.click()
 
+        timeline.begin("open product")
         # 2) Open a specific product (e.g., Ten Pin Bowling). Adjust the link text to actual site link.
         product_link = wait.until(EC.element_to_be_clickable((By.PARTIAL_LINK_TEXT, "Bowling")))
         product_link.click()
@@ -31,6 +36,7 @@ def test_product_enquiry_flow():
         # We expect at least one thumbnail; if not present, test purposefully checks presence
         assert len(thumbs) >= 1
 
+        timeline.begin("fill enquiry")
         # 4) Fill Enquire form — usually a contact form on product page
         # Scroll into view or click the Enquire button that opens modal
         enquire_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "a.enquire-now, button.enquire-now")))
@@ -41,19 +47,23 @@ def test_product_enquiry_flow():
         driver.find_element(By.NAME, "email").send_keys("tester@example.com")
         driver.find_element(By.NAME, "phone").send_keys("9999999999")
         driver.find_element(By.NAME, "message").send_keys("Requesting technical specs and quote for bowling equipment.")
+        timeline.begin("submit enquiry")
         driver.find_element(By.CSS_SELECTOR, "button.submit-enquiry").click()
 
         # 5) Assert success message or thank-you page
         success = wait.until(EC.visibility_of_element_located((By.XPATH, "//*[contains(text(),'Thank') or contains(text(),'success')]")))
         assert success is not None
         print("PASSED: enquiry submitted")
+        print("Waits:", wait.summary())
+        status = "passed"
 
     except Exception:
-        driver.save_screenshot("inco_failure.png")
+        capture_failure(driver, "test_product_enquiry_flow")     # queued; written in the background
         traceback.print_exc()
         raise
     finally:
-        driver.quit()
+        timeline.finish(status)
 
 if __name__ == "__main__":
-    test_product_enquiry_flow()
+    with DriverPool(size=1) as pool, pool.driver() as driver:
+        test_product_enquiry_flow(driver)
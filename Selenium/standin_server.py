@@ -0,0 +1,179 @@
+"""
+Local stand-in for the three sites the Selenium flows drive, so the UI suite runs offline.
+Pages carry exactly the selectors the flows use; each app lives under its own prefix:
+  /flipkart  search -> .product-card a -> button.add-to-cart -> a[href*='/cart'] -> .cart-item / .cart-total .amount
+  /zento     login form -> "Create Claim" (title/amount/date/category/file) -> "My Claims" table
+  /inco      "Products" -> "...Bowling..." -> h1.product-title, .product-gallery img, .enquire-now modal -> thank-you
+Run standalone: python standin_server.py [port]
+"""
+
+import html, os, sys, threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PRODUCTS = {1: ("Smartphone X Pro", 15000.0), 2: ("Smartphone Lite", 9000.0), 3: ("Phone Cover - Blue", 299.0)}
+THUMB = "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='80' height='60'/%3E"
+
+def page(title, body):
+    return f"<!doctype html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title></head><body>{body}</body></html>"
+
+class StandinHandler(BaseHTTPRequestHandler):
+    claims = {}                 # zento user -> [claim title]; replaced per server in StandinServer
+    claims_lock = threading.Lock()
+
+    def log_message(self, *args): pass       # keep test output clean
+
+    # ---------- plumbing
+    def _send(self, body, status=200, headers=()):
+        raw = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        for k, v in headers: self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _redirect(self, location, cookies=()):
+        self._send("", 303, [("Location", location)] + [("Set-Cookie", c) for c in cookies])
+
+    def _cookies(self):
+        jar = SimpleCookie(self.headers.get("Cookie", ""))
+        return {k: m.value for k, m in jar.items()}
+
+    def _form(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        ctype = self.headers.get("Content-Type", "")
+        if ctype.startswith("multipart/form-data"):
+            msg = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {ctype}\r\n\r\n".encode() + raw)
+            return {part.get_param("name", header="content-disposition"): part.get_content() for part in msg.iter_parts()}
+        return {k: v[0] for k, v in parse_qs(raw.decode("utf-8")).items()}
+
+    def do_GET(self): self._route("GET")
+    def do_POST(self): self._route("POST")
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        app, _, rest = url.path.lstrip("/").partition("/")
+        handler = getattr(self, f"{app}_{method.lower()}", None)
+        if handler is None: return self._send(page("Not found", "<h1>Not found</h1>"), 404)
+        handler("/" + rest, parse_qs(url.query))
+
+    # ---------- e-commerce (flipkart-like)
+    def flipkart_get(self, path, query):
+        if path == "/":
+            return self._send(page("Shop", "<form action='/flipkart/search'><input name='q' type='text'></form>"
+                                            "<a href='/flipkart/cart'>Cart</a>"))
+        if path == "/search":
+            q = query.get("q", [""])[0].lower()
+            cards = "".join(f"<div class='product-card'><a href='/flipkart/product/{pid}'>{html.escape(name)}</a></div>"
+                            for pid, (name, _) in PRODUCTS.items() if q in name.lower())
+            return self._send(page("Results", cards or "<p>No results</p>"))
+        if path.startswith("/product/"):
+            pid = int(path.rsplit("/", 1)[1])
+            name, price = PRODUCTS[pid]
+            return self._send(page(name, f"<h1>{html.escape(name)}</h1><p class='price'>{price:.2f}</p>"
+                                         f"<form method='post' action='/flipkart/cart/add'><input type='hidden' name='id' value='{pid}'>"
+                                         "<button class='add-to-cart' type='submit'>Add to cart</button></form>"))
+        if path == "/cart":
+            cart = [int(i) for i in self._cookies().get("cart", "").split("-") if i]
+            rows = "".join(f"<div class='cart-item'>{html.escape(PRODUCTS[i][0])}</div>" for i in cart)
+            total = sum(PRODUCTS[i][1] for i in cart)
+            return self._send(page("Cart", rows + f"<div class='cart-total'>Total: <span class='amount'>{total:.2f}</span></div>"))
+        self._send(page("Not found", ""), 404)
+
+    def flipkart_post(self, path, query):
+        if path != "/cart/add": return self._send(page("Not found", ""), 404)
+        pid = self._form()["id"]
+        cart = "-".join(filter(None, [self._cookies().get("cart", ""), pid]))
+        self._send(page("Added", "<p>Added to cart.</p><a href='/flipkart/cart'>Go to cart</a>"),
+                   headers=[("Set-Cookie", f"cart={cart}; Path=/flipkart")])
+
+    # ---------- expenses (zento-like)
+    def zento_get(self, path, query):
+        user = self._cookies().get("zento_user")
+        if path == "/login":
+            return self._send(page("Login", "<form method='post' action='/zento/login'>"
+                                            "<input name='username'><input name='password' type='password'>"
+                                            "<button type='submit'>Login</button></form>"))
+        if user is None: return self._redirect("/zento/login")
+        if path == "/home":
+            return self._send(page("Home", "<a href='/zento/claims/new'>Create Claim</a> <a href='/zento/claims'>My Claims</a>"))
+        if path == "/claims/new":
+            return self._send(page("New claim", "<form method='post' action='/zento/claims/new' enctype='multipart/form-data'>"
+                                                "<input name='title'><input name='amount'><input name='date'><input name='category'>"
+                                                "<input type='file' name='receipt'><button type='submit'>Submit</button></form>"))
+        if path == "/claims":
+            with self.claims_lock: titles = list(self.claims.get(user, []))
+            rows = "".join(f"<tr><td>{html.escape(t)}</td></tr>" for t in titles)
+            return self._send(page("My Claims", f"<table>{rows}</table>"))
+        self._send(page("Not found", ""), 404)
+
+    def zento_post(self, path, query):
+        form = self._form()
+        if path == "/login":
+            if not form.get("username") or not form.get("password"): return self._redirect("/zento/login")
+            return self._redirect("/zento/home", [f"zento_user={form['username']}; Path=/zento"])
+        if path == "/claims/new":
+            user = self._cookies().get("zento_user")
+            if user is None: return self._redirect("/zento/login")
+            with self.claims_lock: self.claims.setdefault(user, []).append(form.get("title", ""))
+            return self._send(page("Claim created", "<p>Claim submitted.</p><a href='/zento/claims'>My Claims</a>"))
+        self._send(page("Not found", ""), 404)
+
+    # ---------- product enquiry (inco-like)
+    def inco_get(self, path, query):
+        if path == "/":
+            return self._send(page("Inco", "<nav><a href='/inco/products'>Products</a> <a href='/inco/about'>About</a> "
+                                           "<a href='/inco/contact'>Contact</a></nav>"))
+        if path == "/products":
+            return self._send(page("Products", "<a href='/inco/products/bowling'>Ten Pin Bowling Alley</a> "
+                                               "<a href='/inco/products/arcade'>Arcade Games</a>"))
+        if path.startswith("/products/"):
+            thumbs = "".join(f"<img src=\"{THUMB}\" alt='view {n}'>" for n in range(3))
+            modal = ("<div id='enquiry' style='display:none'><form method='post' action='/inco/enquiry'>"
+                     "<input name='name'><input name='email'><input name='phone'><textarea name='message'></textarea>"
+                     "<button class='submit-enquiry' type='submit'>Send</button></form></div>")
+            return self._send(page("Product", "<h1 class='product-title'>Ten Pin Bowling Alley</h1>"
+                                              f"<div class='product-gallery'>{thumbs}</div>"
+                                              "<button class='enquire-now' onclick=\"document.getElementById('enquiry').style.display='block'\">"
+                                              f"Enquire Now</button>{modal}"))
+        self._send(page("Inco", "<p>Inco</p>"))
+
+    def inco_post(self, path, query):
+        if path != "/enquiry": return self._send(page("Not found", ""), 404)
+        form = self._form()
+        self._send(page("Thanks", f"<p>Thank you {html.escape(form.get('name', ''))}, we will be in touch.</p>"))
+
+class StandinServer:
+    """Serves the stand-in apps from a background thread on 127.0.0.1 (port 0 = any free port)."""
+    def __init__(self, port=0):
+        handler = type("Handler", (StandinHandler,), {"claims": {}})     # fresh claim store per server
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_port}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def export_env(self):
+        """Point the flows at this server (they read *_BASE env vars)."""
+        os.environ["FLIPKART_BASE"] = f"{self.base}/flipkart"
+        os.environ["ZENTO_BASE"] = f"{self.base}/zento"
+        os.environ["INCO_BASE"] = f"{self.base}/inco"
+
+    def __enter__(self): return self.start()
+    def __exit__(self, *exc): self.stop()
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = StandinServer(port)
+    print(f"Stand-in apps on {server.base}/flipkart/ , /zento/login , /inco/")
+    server.httpd.serve_forever()
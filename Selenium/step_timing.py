@@ -0,0 +1,68 @@
+"""
+Per-step timeline for a Selenium flow: wall time, SmartWait timings and the browser's Navigation /
+Resource Timing entries for each logical step, written as one JSON file per run.
+Compare runs against a stored baseline with compare_timelines.py.
+"""
+
+import json, os, time
+from selenium.common.exceptions import WebDriverException
+
+# New document <=> performance.timeOrigin changed; resource entries are reported from `since` onwards.
+COLLECT_JS = """
+const since = arguments[0], lastOrigin = arguments[1];
+const fresh = performance.timeOrigin !== lastOrigin;
+const nav = performance.getEntriesByType("navigation")[0];
+const all = performance.getEntriesByType("resource");
+return {
+  origin: performance.timeOrigin, seen: all.length,
+  navigation: fresh && nav ? {url: nav.name, ttfb_ms: nav.responseStart - nav.requestStart,
+                              dom_content_loaded_ms: nav.domContentLoadedEventEnd, load_ms: nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+                              duration_ms: nav.duration, transfer_bytes: nav.transferSize} : null,
+  resources: all.slice(fresh ? 0 : since).map(r => ({url: r.name, type: r.initiatorType, ms: r.duration, bytes: r.transferSize}))
+};
+"""
+
+class FlowTimeline:
+    def __init__(self, driver, flow, out_dir=None):
+        self.driver, self.flow = driver, flow
+        self.out_dir = out_dir or os.getenv("SELENIUM_TIMELINE_DIR", "timelines")
+        self.waits = []                       # pass as SmartWait(..., log=timeline.waits)
+        self.steps = []
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._origin, self._seen = None, 0
+        self._current = None
+
+    def begin(self, name):
+        """Close the current step (if any) and start timing `name`."""
+        self._end_step("ok")
+        self._current = {"step": name, "status": "ok", "_start": time.perf_counter(), "_first_wait": len(self.waits)}
+
+    def _end_step(self, status):
+        step, self._current = self._current, None
+        if step is None: return
+        step["status"] = status
+        step["seconds"] = round(time.perf_counter() - step.pop("_start"), 4)
+        step["waits"] = self.waits[step.pop("_first_wait"):]
+        step.update(self._browser_metrics())
+        self.steps.append(step)
+
+    def _browser_metrics(self):
+        try: data = self.driver.execute_script(COLLECT_JS, self._seen, self._origin)
+        except WebDriverException: return {}
+        self._origin, self._seen = data["origin"], data["seen"]
+        res = data["resources"]
+        metrics = {"resources": {"count": len(res), "transfer_bytes": sum(r["bytes"] or 0 for r in res),
+                                 "slowest": sorted(res, key=lambda r: r["ms"], reverse=True)[:3]}}
+        if data["navigation"]: metrics["navigation"] = data["navigation"]
+        return metrics
+
+    def finish(self, status="passed"):
+        """End the last step (marked failed unless the flow passed) and write the timeline; returns its path."""
+        self._end_step("ok" if status == "passed" else "failed")
+        os.makedirs(self.out_dir, exist_ok=True)
+        doc = {"flow": self.flow, "status": status, "started_at": self.started_at,
+               "total_seconds": round(time.perf_counter() - self._t0, 4), "steps": self.steps}
+        path = os.path.join(self.out_dir, f"{self.flow}-{int(self.started_at * 1000)}-{os.getpid()}.json")
+        with open(path, "w") as f: json.dump(doc, f, indent=2)
+        return path
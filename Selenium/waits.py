@@ -0,0 +1,107 @@
+"""
+Drop-in replacement for WebDriverWait(driver, N).until(EC...) without the fixed 0.5s polling.
+Between checks it blocks inside the browser until the DOM mutates (an injected MutationObserver),
+so a condition is re-checked as soon as the page changes; when nothing mutates (CSS transitions,
+layout) it falls back to polling that starts at a few ms and backs off. Every wait is timed.
+"""
+
+import os, time
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+
+# Resolves true on the next DOM mutation, false after arguments[0] ms. Installs the observer on first use per document.
+AWAIT_MUTATION_JS = """
+const timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+let w = window.__qaWatch;
+if (!w) {
+    w = window.__qaWatch = {waiters: new Set(), pending: 0};
+    new MutationObserver(() => { for (const fire of [...w.waiters]) fire(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    const track = p => { w.pending++; const end = () => { w.pending--; for (const fire of [...w.waiters]) fire(); }; p.then(end, end); return p; };
+    const origFetch = window.fetch;
+    if (origFetch) window.fetch = (...a) => track(origFetch.apply(window, a));
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...a) {
+        track(new Promise(r => this.addEventListener("loadend", r, {once: true})));
+        return origSend.apply(this, a);
+    };
+}
+const fire = () => { clearTimeout(timer); w.waiters.delete(fire); done(true); };
+const timer = setTimeout(() => { w.waiters.delete(fire); done(false); }, timeoutMs);
+w.waiters.add(fire);
+"""
+
+# Resolves once document.readyState is complete and no tracked fetch/XHR has been in flight for quietMs.
+NETWORK_IDLE_JS = """
+const quietMs = arguments[0], done = arguments[arguments.length - 1];
+let idleSince = null;
+(function check() {
+    const busy = document.readyState !== "complete" || (window.__qaWatch && window.__qaWatch.pending > 0);
+    const now = performance.now();
+    if (busy) idleSince = null; else if (idleSince === null) idleSince = now;
+    if (idleSince !== null && now - idleSince >= quietMs) return done(true);
+    setTimeout(check, 10);
+})();
+"""
+
+def describe(condition):
+    """Readable label for an expected_conditions predicate, e.g. visibility_of_element_located(css selector, .cart-item)."""
+    name = getattr(condition, "__qualname__", type(condition).__name__).split(".<locals>")[0]
+    for cell in getattr(condition, "__closure__", None) or ():
+        try: value = cell.cell_contents
+        except ValueError: continue
+        if isinstance(value, tuple) and len(value) == 2: return f"{name}({value[0]}, {value[1]})"
+    return name
+
+class SmartWait:
+    def __init__(self, driver, timeout=15, min_poll=0.005, max_poll=0.25, backoff=2.0,
+                 use_events=None, ignored_exceptions=(NoSuchElementException,), log=None):
+        self.driver, self.timeout = driver, timeout
+        self.min_poll, self.max_poll, self.backoff = min_poll, max_poll, backoff
+        self.use_events = os.getenv("SELENIUM_WAIT_EVENTS", "1") != "0" if use_events is None else use_events
+        self.ignored = tuple(ignored_exceptions)
+        self.timings = [] if log is None else log     # share one list across waits to get a per-flow log
+
+    def until(self, condition, message="", label=None):
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        delay, checks, error = self.min_poll, 0, None
+        while True:
+            checks += 1
+            try:
+                value = condition(self.driver)
+                if value:
+                    self._record(label or describe(condition), start, checks, "ok")
+                    return value
+            except self.ignored as e: error = e
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self._record(label or describe(condition), start, checks, "timeout")
+                raise TimeoutException(message or f"{describe(condition)} not met after {self.timeout}s", getattr(error, "screen", None), getattr(error, "stacktrace", None))
+            self._pause(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_poll)
+
+    def _pause(self, seconds):
+        if self.use_events:
+            try:
+                self.driver.execute_async_script(AWAIT_MUTATION_JS, int(seconds * 1000))
+                return
+            except WebDriverException: pass      # page mid-navigation: no document to observe yet
+        time.sleep(seconds)
+
+    def network_idle(self, quiet=0.2, label="network idle"):
+        """Block until the page has loaded and fetch/XHR traffic (seen since the first wait) has been quiet."""
+        start = time.perf_counter()
+        self.driver.set_script_timeout(self.timeout)
+        try: self.driver.execute_async_script(NETWORK_IDLE_JS, int(quiet * 1000))
+        except TimeoutException:
+            self._record(label, start, 1, "timeout")
+            raise
+        self._record(label, start, 1, "ok")
+
+    def _record(self, label, start, checks, outcome):
+        self.timings.append({"wait": label, "seconds": round(time.perf_counter() - start, 4), "checks": checks, "outcome": outcome})
+
+    def summary(self):
+        total = sum(t["seconds"] for t in self.timings)
+        slowest = max(self.timings, key=lambda t: t["seconds"], default=None)
+        return f"{len(self.timings)} waits, {total:.2f}s waiting" + (f", slowest {slowest['wait']} {slowest['seconds']:.2f}s" if slowest else "")
@@ -0,0 +1,49 @@
+"""
+SmartWait against a fake driver: backoff, the timeout path and the time.sleep fallback, without a browser.
+"""
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+import waits
+from waits import AWAIT_MUTATION_JS, SmartWait
+
+class FakeDriver:
+    """Records every in-browser wait SmartWait asks for; nothing mutates, so each one returns at once."""
+    def __init__(self, script_error=None):
+        self.script_error, self.awaited_ms = script_error, []
+    def execute_async_script(self, script, timeout_ms):
+        assert script == AWAIT_MUTATION_JS
+        if self.script_error: raise self.script_error
+        self.awaited_ms.append(timeout_ms)
+        return False
+
+def ready_after(n, value="cart"):
+    checks = []
+    def condition(driver):
+        checks.append(driver)
+        return value if len(checks) > n else None
+    return condition
+
+def test_pauses_back_off_from_min_poll_to_max_poll():
+    driver, log = FakeDriver(), []
+    wait = SmartWait(driver, timeout=15, min_poll=0.005, max_poll=0.25, backoff=2.0, use_events=True, log=log)
+    assert wait.until(ready_after(8), label="cart badge") == "cart"
+    assert driver.awaited_ms == [5, 10, 20, 40, 80, 160, 250, 250]
+    assert log == [{"wait": "cart badge", "seconds": log[0]["seconds"], "checks": 9, "outcome": "ok"}]
+
+def test_timeout_is_recorded_and_raised():
+    def missing(driver): raise NoSuchElementException("no .order-confirmation")
+    wait = SmartWait(FakeDriver(), timeout=0.05, min_poll=0.01, use_events=False)
+    with pytest.raises(TimeoutException, match="not met after 0.05s"):
+        wait.until(missing, label="order confirmation")
+    (entry,) = wait.timings
+    assert entry["outcome"] == "timeout" and entry["checks"] > 1 and entry["seconds"] >= 0.05
+    assert "1 waits" in wait.summary()
+
+def test_falls_back_to_sleep_when_the_page_has_no_document(monkeypatch):
+    slept = []
+    monkeypatch.setattr(waits.time, "sleep", slept.append)
+    driver = FakeDriver(script_error=WebDriverException("javascript error: document unloaded"))
+    wait = SmartWait(driver, min_poll=0.005, max_poll=0.02, use_events=True)
+    assert wait.until(ready_after(3), label="search results") == "cart"
+    assert slept == [0.005, 0.01, 0.02] and driver.awaited_ms == []